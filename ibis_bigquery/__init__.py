@@ -1,29 +1,72 @@
 """BigQuery public API."""
+import asyncio
+import collections
+import contextlib
+import datetime
+import functools
+import threading
+import time
+import uuid
 import warnings
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 import google.auth.credentials
 import google.cloud.bigquery as bq
+import ibis.common.exceptions as com
+import ibis.expr.datatypes as dt
 import ibis.expr.schema as sch
 import ibis.expr.types as ir
+import pandas as pd
+import pyarrow as pa
 import pydata_google_auth
-from google.api_core.exceptions import NotFound
+import pydata_google_auth.cache
+from google.api_core.exceptions import NotFound, PermissionDenied
+from google.cloud import bigquery_storage
 from ibis.backends.base.sql import BaseSQLBackend
-from pydata_google_auth import cache
 
-from ibis_bigquery.compiler import BigQueryCompiler
+from ibis_bigquery.compiler import (
+    BigQueryCompiler,
+    compile_cache_key,
+    persistent_udf_definitions,
+)
 
 from . import version as ibis_bigquery_version
+from .cache import LRUCache, ResultCache, result_cache_key
 from .client import (
+    HAS_ARROW_WRITES,
+    HAS_SESSIONS,
+    ON_DEMAND_PRICE_PER_TIB,
+    REST_READ_MAX_ROWS,
+    RESULT_HAS_JOB_RETRY,
     BigQueryCursor,
     BigQueryDatabase,
+    BigQueryStorageReader,
+    BigQueryStorageWriter,
     BigQueryTable,
+    MaximumBytesBilledExceeded,
+    QueryEstimate,
+    QueryHandle,
+    QueryRecord,
+    RetryPolicy,
     _create_client_info,
-    bigquery_field_to_ibis_dtype,
+    _create_client_info_gapic,
+    arrow_to_pandas,
     bigquery_param,
+    bigquery_value_to_scalar,
+    cancel_on_interrupt,
+    contains_order_by,
+    dry_run_schema,
+    estimate_from_dry_run,
+    ibis_schema_to_bigquery_schema,
+    is_session_expired,
+    load_arrow_table,
     parse_project_and_dataset,
+    poll_delays,
+    rechunk_arrow_batches,
     rename_partitioned_column,
+    string_dictionary_schema,
 )
+from .scheduler import FairScheduler
 
 try:
     from .udf import udf  # noqa F401
@@ -56,6 +99,9 @@ class Backend(BaseSQLBackend):
     database_class = BigQueryDatabase
     table_class = BigQueryTable
 
+    #: Compiled queries shared by all backends, keyed by expression structure.
+    compile_cache = LRUCache(maxsize=512)
+
     def connect(
         self,
         project_id: Optional[str] = None,
@@ -66,6 +112,20 @@ class Backend(BaseSQLBackend):
         auth_external_data: bool = False,
         auth_cache: str = "default",
         partition_column: Optional[str] = "PARTITIONTIME",
+        read_parallelism: Optional[int] = None,
+        table_cache_size: int = 128,
+        table_cache_ttl: Optional[float] = 60.0,
+        result_cache_dir: Optional[str] = None,
+        result_cache_max_bytes: int = 2**30,
+        scratch_dataset: Optional[str] = None,
+        scratch_table_ttl: float = 24 * 60 * 60,
+        maximum_bytes_billed: Optional[int] = None,
+        check_bytes_billed: bool = False,
+        query_log_size: int = 100,
+        job_timeout: Optional[float] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        batch_concurrency: int = 4,
+        session: bool = False,
     ) -> "Backend":
         """Create a :class:`Backend` for use with Ibis.
 
@@ -108,12 +168,77 @@ class Backend(BaseSQLBackend):
         partition_column : str
             Identifier to use instead of default ``_PARTITIONTIME`` partition
             column. Defaults to ``'PARTITIONTIME'``.
+        read_parallelism : int, optional
+            Maximum number of BigQuery Storage API streams used to download
+            query results, each read on its own thread. If not set, BigQuery
+            chooses the number of streams, and they are read by at most
+            ``min(32, os.cpu_count() + 4)`` threads. Results of queries with
+            an ``ORDER BY`` are always read through a single stream.
+        table_cache_size : int
+            Maximum number of tables whose metadata is kept in memory.
+        table_cache_ttl : float, optional
+            Number of seconds table metadata and the names listed by
+            ``list_tables`` and ``list_databases`` are cached for. Cached
+            metadata never expires if set to ``None``. Use
+            :meth:`Backend.invalidate` to refresh a table whose schema has
+            changed, or :meth:`Backend.clear_cache`.
+        result_cache_dir : str, optional
+            Directory in which to cache the results of :meth:`Backend.execute`
+            as Arrow files. Results are reused when the compiled query, its
+            parameter values and the last modified time of every table it
+            reads are unchanged. Checking the tables costs a dry run and a
+            metadata request per table on each call. Don't enable this for
+            queries whose results depend on the time they run, such as
+            those using ``CURRENT_TIMESTAMP()``. Disabled if not set.
+        result_cache_max_bytes : int
+            Maximum total size of the cached results. The least recently
+            used results are deleted when it is exceeded.
+        scratch_dataset : str, optional
+            A ``<project>.<dataset>`` or ``<dataset>`` in which to create the
+            temporary result tables of ``execute(..., large_results=True)``.
+        scratch_table_ttl : float
+            Number of seconds after which BigQuery deletes a temporary result
+            table, if it wasn't already deleted after reading it.
+        maximum_bytes_billed : int, optional
+            Limit on the bytes billed for each query. BigQuery fails queries
+            that would bill more, without charging for them. No limit is set
+            if not given.
+        check_bytes_billed : bool
+            Estimate the bytes processed by each query with a dry run before
+            running it, and raise :class:`MaximumBytesBilledExceeded` if the
+            estimate is over `maximum_bytes_billed`.
+        query_log_size : int
+            Number of recent queries kept in :attr:`Backend.query_log`.
+        job_timeout : float, optional
+            Number of seconds to wait for each query job to finish before
+            cancelling it. Where the installed google-cloud-bigquery supports
+            it, BigQuery is also asked to stop the job after this long.
+        retry_policy : RetryPolicy, optional
+            Resubmit query jobs that fail with transient errors, such as rate
+            limits, according to this policy. Failed jobs aren't retried if
+            not given.
+        batch_concurrency : int
+            Maximum number of queries executed with ``priority="BATCH"``
+            running at the same time. Other batch queries wait in
+            :attr:`Backend.batch_scheduler`.
+        session : bool
+            Run queries in a BigQuery session. The temporary functions
+            defined by UDFs are then created once per session instead of
+            being sent with every query that calls them. A session that
+            has expired is replaced by a new one with the same functions.
+            Requires google-cloud-bigquery 2.29 or later.
 
         Returns
         -------
         Backend
 
         """
+        if session and not HAS_SESSIONS:
+            raise com.UnsupportedOperationError(
+                "session=True requires google-cloud-bigquery 2.29 or later, "
+                "got {}".format(bq.__version__)
+            )
+
         default_project_id = ""
 
         if credentials is None:
@@ -122,15 +247,15 @@ class Backend(BaseSQLBackend):
                 scopes = EXTERNAL_DATA_SCOPES
 
             if auth_cache == "default":
-                credentials_cache = cache.ReadWriteCredentialsCache(
+                credentials_cache = pydata_google_auth.cache.ReadWriteCredentialsCache(
                     filename="ibis.json"
                 )
             elif auth_cache == "reauth":
-                credentials_cache = cache.WriteOnlyCredentialsCache(
+                credentials_cache = pydata_google_auth.cache.WriteOnlyCredentialsCache(
                     filename="ibis.json"
                 )
             elif auth_cache == "none":
-                credentials_cache = cache.NOOP
+                credentials_cache = pydata_google_auth.cache.NOOP
             else:
                 raise ValueError(
                     f"Got unexpected value for auth_cache = '{auth_cache}'. "
@@ -160,7 +285,44 @@ class Backend(BaseSQLBackend):
             credentials=credentials,
             client_info=_create_client_info(application_name),
         )
+        new_backend.storage_client = bigquery_storage.BigQueryReadClient(
+            credentials=credentials,
+            client_info=_create_client_info_gapic(application_name),
+        )
         new_backend.partition_column = partition_column
+        new_backend.read_parallelism = read_parallelism
+        new_backend._query_schema_cache = LRUCache()
+        new_backend._table_cache = LRUCache(
+            maxsize=table_cache_size, ttl=table_cache_ttl
+        )
+        new_backend._name_cache = LRUCache(
+            maxsize=table_cache_size, ttl=table_cache_ttl
+        )
+        new_backend.result_cache = (
+            None
+            if result_cache_dir is None
+            else ResultCache(result_cache_dir, max_bytes=result_cache_max_bytes)
+        )
+        new_backend.scratch_dataset = scratch_dataset
+        new_backend.scratch_table_ttl = scratch_table_ttl
+        new_backend.maximum_bytes_billed = maximum_bytes_billed
+        new_backend.check_bytes_billed = check_bytes_billed
+        new_backend.query_log = collections.deque(maxlen=query_log_size)
+        new_backend._query_listeners = []
+        new_backend.job_timeout = job_timeout
+        new_backend.retry_policy = retry_policy
+        new_backend.batch_scheduler = FairScheduler(batch_concurrency)
+        new_backend.session = session
+        new_backend._session_id = None
+        # Used as an ordered set, so that functions can be recreated in the
+        # order they were defined.
+        new_backend._session_definitions = {}
+        new_backend._session_lock = threading.RLock()
+        new_backend._deployed_udfs = set()
+        # The write client is created on first use by append_stream.
+        new_backend.write_client = None
+        new_backend._credentials = credentials
+        new_backend._application_name = application_name
 
         return new_backend
 
@@ -184,9 +346,34 @@ class Backend(BaseSQLBackend):
     def table(self, name, database=None) -> ir.TableExpr:
         t = super().table(name, database=database)
         table_id = self._fully_qualified_name(name, database)
-        bq_table = self.client.get_table(table_id)
+        bq_table = self._get_bq_table(table_id)
         return rename_partitioned_column(t, bq_table, self.partition_column)
 
+    def _get_bq_table(self, table_id):
+        bq_table = self._table_cache.get(table_id)
+        if bq_table is None:
+            bq_table = self.client.get_table(table_id)
+            self._table_cache[table_id] = bq_table
+        return bq_table
+
+    def invalidate(self, name, database=None):
+        """Drop the cached metadata of a table.
+
+        Parameters
+        ----------
+        name : str
+            A table name, optionally qualified with its dataset and project.
+        database : str, optional
+            The dataset of the table, if `name` isn't qualified.
+        """
+        self._table_cache.pop(self._fully_qualified_name(name, database))
+
+    def clear_cache(self):
+        """Drop all cached table metadata, table names and query schemas."""
+        self._table_cache.clear()
+        self._name_cache.clear()
+        self._query_schema_cache.clear()
+
     def _fully_qualified_name(self, name, database):
         parts = name.split(".")
         if len(parts) == 3:
@@ -200,37 +387,257 @@ class Backend(BaseSQLBackend):
         raise ValueError("Got too many components in table name: {}".format(name))
 
     def _get_schema_using_query(self, limited_query):
-        with self._execute(limited_query, results=True) as cur:
-            # resets the state of the cursor and closes operation
-            names, ibis_types = self._adapt_types(cur.description)
-        return sch.Schema(names, ibis_types)
+        # A dry run returns the schema of the results without running, and
+        # billing, the query.
+        schema = self._query_schema_cache.get(limited_query)
+        if schema is None:
+            job = self._submit(limited_query, dry_run=True)
+            schema = dry_run_schema(job)
+            self._query_schema_cache[limited_query] = schema
+        return schema
 
     def _get_table_schema(self, qualified_name):
         dataset, table = qualified_name.rsplit(".", 1)
         assert dataset is not None, "dataset is None"
         return self.get_schema(table, database=dataset)
 
-    def _adapt_types(self, descr):
-        names = []
-        adapted_types = []
-        for col in descr:
-            names.append(col.name)
-            typename = bigquery_field_to_ibis_dtype(col)
-            adapted_types.append(typename)
-        return names, adapted_types
-
-    def _execute(self, stmt, results=True, query_parameters=None):
+    def _submit(
+        self,
+        stmt,
+        query_parameters=None,
+        dry_run=False,
+        destination=None,
+        maximum_bytes_billed=None,
+        record=None,
+        timeout=None,
+        priority=None,
+        create_session=False,
+        write_disposition=None,
+    ):
+        job_config = self._job_config(
+            stmt,
+            query_parameters=query_parameters,
+            dry_run=dry_run,
+            destination=destination,
+            maximum_bytes_billed=maximum_bytes_billed,
+            timeout=timeout,
+            priority=priority,
+            create_session=create_session,
+            write_disposition=write_disposition,
+        )
+        query = self.client.query(
+            stmt, job_config=job_config, project=self.billing_project
+        )
+        if not dry_run:
+            if record is None:
+                record = QueryRecord(stmt)
+            if record.job_id is None:
+                # Retries update the record of the first submission.
+                self.query_log.append(record)
+            record.job_id = query.job_id
+            self._emit("job_submit", record)
+        return query
+
+    def _job_config(
+        self,
+        stmt,
+        query_parameters=None,
+        dry_run=False,
+        destination=None,
+        maximum_bytes_billed=None,
+        timeout=None,
+        priority=None,
+        create_session=False,
+        write_disposition=None,
+    ):
         job_config = bq.job.QueryJobConfig()
         job_config.query_parameters = query_parameters or []
         job_config.use_legacy_sql = False  # False by default in >=0.28
-        query = self.client.query(
-            stmt, job_config=job_config, project=self.billing_project
+        if create_session:
+            job_config.create_session = True
+        elif self.session and self._session_id is not None:
+            job_config.connection_properties = [
+                bq.ConnectionProperty("session_id", self._session_id)
+            ]
+        if dry_run:
+            job_config.dry_run = True
+            job_config.use_query_cache = False
+        else:
+            if maximum_bytes_billed is None:
+                maximum_bytes_billed = self.maximum_bytes_billed
+            if maximum_bytes_billed is not None:
+                if self.check_bytes_billed:
+                    self._check_bytes_billed(
+                        stmt, query_parameters, maximum_bytes_billed
+                    )
+                job_config.maximum_bytes_billed = maximum_bytes_billed
+            if timeout is None:
+                timeout = self.job_timeout
+            # Added in google-cloud-bigquery 3.4.
+            if timeout is not None and hasattr(job_config, "job_timeout_ms"):
+                job_config.job_timeout_ms = int(timeout * 1000)
+        if destination is not None:
+            job_config.destination = destination
+            job_config.write_disposition = (
+                write_disposition or bq.WriteDisposition.WRITE_TRUNCATE
+            )
+        if priority is not None:
+            job_config.priority = priority
+        return job_config
+
+    def _check_bytes_billed(self, stmt, query_parameters, maximum_bytes_billed):
+        job = self._submit(stmt, query_parameters=query_parameters, dry_run=True)
+        estimated_bytes = job.total_bytes_processed or 0
+        if estimated_bytes > maximum_bytes_billed:
+            raise MaximumBytesBilledExceeded(estimated_bytes, maximum_bytes_billed)
+
+    def _execute(
+        self,
+        stmt,
+        results=True,
+        query_parameters=None,
+        destination=None,
+        maximum_bytes_billed=None,
+        record=None,
+        timeout=None,
+        priority=None,
+        caller=None,
+        write_disposition=None,
+    ):
+        if record is None:
+            record = QueryRecord(stmt)
+        if timeout is None:
+            timeout = self.job_timeout
+        if priority is not None:
+            priority = priority.upper()
+            if priority not in (bq.QueryPriority.BATCH, bq.QueryPriority.INTERACTIVE):
+                raise ValueError(
+                    "priority must be 'BATCH' or 'INTERACTIVE', got {!r}".format(
+                        priority
+                    )
+                )
+        if priority == bq.QueryPriority.BATCH:
+            slot = self.batch_scheduler.slot(caller)
+        else:
+            slot = contextlib.nullcontext()
+
+        with slot:
+            query, rows = self._run_job(
+                stmt,
+                record,
+                timeout,
+                query_parameters=query_parameters,
+                destination=destination,
+                maximum_bytes_billed=maximum_bytes_billed,
+                priority=priority,
+                write_disposition=write_disposition,
+            )
+        self._job_done(query, record)
+        return BigQueryCursor(query, record, result=rows)
+
+    def _run_job(self, stmt, record, timeout, **kwargs):
+        result_kwargs = {"timeout": timeout}
+        if self.retry_policy is not None and RESULT_HAS_JOB_RETRY:
+            result_kwargs["job_retry"] = None
+
+        def attempt():
+            query = self._submit(stmt, record=record, timeout=timeout, **kwargs)
+            with cancel_on_interrupt(query):
+                rows = query.result(**result_kwargs)  # blocks until finished
+            return query, rows
+
+        return self._retry(lambda: self._in_session(attempt), record)
+
+    def _retry(self, attempt, record):
+        # Call attempt until it succeeds or the retry policy gives up.
+        policy = self.retry_policy
+        if policy is not None:
+            delays = policy.delays()
+            start = time.monotonic()
+
+        while True:
+            try:
+                return attempt()
+            except Exception as exc:
+                if policy is None or not policy.is_retryable(exc):
+                    raise
+                delay = next(delays)
+                if record.retries + 1 >= policy.max_attempts or (
+                    policy.deadline is not None
+                    and time.monotonic() - start + delay > policy.deadline
+                ):
+                    raise
+                record.retries += 1
+                self._emit("job_retry", record)
+                time.sleep(delay)
+
+    def _job_done(self, query, record):
+        record.update_from_job(query)
+        self._emit("job_done", record)
+
+    def add_query_listener(self, listener):
+        """Call `listener` at each step of the execution of every query.
+
+        The steps are the compilation of an expression, the submission of a
+        query job, the end of the job, the end of the download of its
+        results and the end of their conversion to pandas. Listeners are
+        called synchronously, in the thread running the query.
+
+        Parameters
+        ----------
+        listener : Callable[[QueryEvent], None]
+
+        Returns
+        -------
+        Callable[[QueryEvent], None]
+          `listener`, so that this method can be used as a decorator.
+
+        Examples
+        --------
+        >>> @con.add_query_listener  # doctest: +SKIP
+        ... def log_slow_queries(event):
+        ...     if event.kind == "job_done" and event.execution_seconds > 60:
+        ...         print(event.job_id, event.sql)
+        """
+        self._query_listeners.append(listener)
+        return listener
+
+    def remove_query_listener(self, listener):
+        """Stop calling a listener added with :meth:`add_query_listener`."""
+        self._query_listeners.remove(listener)
+
+    def _emit(self, kind, record):
+        listeners = tuple(self._query_listeners)
+        if listeners:
+            event = record.event(kind)
+            for listener in listeners:
+                listener(event)
+
+    def raw_sql(
+        self,
+        query: str,
+        results=False,
+        params=None,
+        destination=None,
+        maximum_bytes_billed: Optional[int] = None,
+        timeout: Optional[float] = None,
+        priority: Optional[str] = None,
+        caller=None,
+    ):
+        query_parameters = self._query_parameters(params)
+        return self._execute(
+            query,
+            results=results,
+            query_parameters=query_parameters,
+            destination=destination,
+            maximum_bytes_billed=maximum_bytes_billed,
+            timeout=timeout,
+            priority=priority,
+            caller=caller,
         )
-        query.result()  # blocks until finished
-        return BigQueryCursor(query)
 
-    def raw_sql(self, query: str, results=False, params=None):
-        query_parameters = [
+    def _query_parameters(self, params):
+        return [
             bigquery_param(
                 # unwrap Alias instances
                 #
@@ -250,7 +657,6 @@ class Backend(BaseSQLBackend):
             )
             for param, value in (params or {}).items()
         ]
-        return self._execute(query, results=results, query_parameters=query_parameters)
 
     @property
     def current_database(self) -> str:
@@ -265,7 +671,20 @@ class Backend(BaseSQLBackend):
             )
         return self.database_class(name or self.dataset, self)
 
-    def execute(self, expr, params=None, limit="default", **kwargs):
+    def execute(
+        self,
+        expr,
+        params=None,
+        limit="default",
+        destination: Optional[str] = None,
+        large_results: bool = False,
+        maximum_bytes_billed: Optional[int] = None,
+        timeout: Optional[float] = None,
+        priority: Optional[str] = None,
+        caller=None,
+        string_dictionary=False,
+        **kwargs,
+    ):
         """Compile and execute the given Ibis expression.
 
         Compile and execute Ibis expression using this backend client
@@ -278,6 +697,37 @@ class Backend(BaseSQLBackend):
           For expressions yielding result yets; retrieve at most this number of
           values/rows. Overrides any limit already set on the expression.
         params : not yet implemented
+        destination : str, optional
+          Name of a table to write the results to, replacing its contents.
+          The table can be used by later expressions without running the
+          query again. All rows are written unless `limit` is given.
+        large_results : bool
+          Write the results to a temporary table in the scratch dataset set
+          with :meth:`Backend.connect`, avoiding the size limit of anonymous
+          query results. The table is deleted once the results are read.
+          All rows are returned unless `limit` is given.
+        maximum_bytes_billed : int, optional
+          Fail the query instead of billing more than this number of bytes.
+          Overrides the limit set with :meth:`Backend.connect`.
+        timeout : float, optional
+          Number of seconds to wait for the query job to finish. The job is
+          cancelled when the timeout expires, or if waiting is interrupted,
+          for example with Ctrl-C. Overrides the `job_timeout` set with
+          :meth:`Backend.connect`.
+        priority : str, optional
+          ``"INTERACTIVE"`` (the default) or ``"BATCH"``. Batch queries are
+          queued by BigQuery until idle resources are available and don't
+          count towards the concurrent interactive query limit. They also
+          wait for a slot in :attr:`Backend.batch_scheduler` before being
+          submitted.
+        caller : Hashable, optional
+          Who a batch query runs for. Slots of the batch scheduler are shared
+          fairly among callers. Defaults to the current thread.
+        string_dictionary : bool or Sequence[str]
+          Return string columns as :class:`pandas.Categorical` columns,
+          which store each distinct value once. ``True`` for all string
+          columns, or the names of the columns. Suits columns with few
+          distinct values.
         kwargs : Backends can receive extra params. For example, clickhouse
             uses this to receive external_tables as dataframes.
 
@@ -288,14 +738,535 @@ class Backend(BaseSQLBackend):
           Array expressions: pandas.Series
           Scalar expressions: Python scalar value
         """
-        # TODO: upstream needs to pass params to raw_sql, I think.
+        if maximum_bytes_billed is not None:
+            kwargs["maximum_bytes_billed"] = maximum_bytes_billed
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        if priority is not None:
+            kwargs["priority"] = priority
+        if caller is not None:
+            kwargs["caller"] = caller
+        if limit == "default" and (destination is not None or large_results):
+            # The default limit would silently truncate the results.
+            limit = None
+
+        if destination is None and large_results:
+            with self._scratch_table() as scratch_table:
+                return self.execute(
+                    expr,
+                    params=params,
+                    limit=limit,
+                    destination=scratch_table,
+                    string_dictionary=string_dictionary,
+                    **kwargs,
+                )
+
+        if destination is not None:
+            kwargs["destination"] = self._fully_qualified_name(destination, None)
+        elif self._use_scalar_path(expr):
+            return self._execute_scalar(expr, params, limit, **kwargs)
+        elif self.result_cache is not None:
+            return self._execute_cached(
+                expr, params, limit, string_dictionary=string_dictionary, **kwargs
+            )
+        query_ast, cursor = self._run_expr(expr, params, limit, **kwargs)
+        return self._fetch_result(
+            cursor, query_ast, string_dictionary=string_dictionary
+        )
+
+    def _use_scalar_path(self, expr):
+        return (
+            self.result_cache is None
+            and isinstance(expr, ir.ScalarExpr)
+            and not isinstance(expr.type(), (dt.Array, dt.Struct))
+        )
+
+    def _execute_scalar(self, expr, params, limit, **kwargs):
+        # The value is read from the first row of the results without
+        # building a DataFrame. The query still runs as a regular job: the
+        # stateless jobs.query API only reports its job once the query has
+        # finished or the request has returned, so a query interrupted while
+        # it waits couldn't be cancelled.
         kwargs.pop("timecontext", None)
-        query_ast = self.compiler.to_ast_ensure_limit(expr, limit, params=params)
-        sql = query_ast.compile()
+        _, sql, record = self._compile_expr(expr, params, limit)
+        cursor = self._execute(
+            sql,
+            query_parameters=self._query_parameters(params),
+            record=record,
+            **kwargs,
+        )
+        start = time.perf_counter()
+        row = next(iter(cursor.query.result(max_results=1)), None)
+        record.download_seconds = time.perf_counter() - start
+        self._emit("fetch_done", record)
+        return bigquery_value_to_scalar(None if row is None else row[0], expr.type())
+
+    @contextlib.contextmanager
+    def _scratch_table(self):
+        if self.scratch_dataset is None:
+            raise ValueError(
+                "large_results requires a scratch dataset. Pass "
+                "scratch_dataset to connect() or use the destination "
+                "argument instead."
+            )
+        project, dataset = self._parse_project_and_dataset(self.scratch_dataset)
+        table = bq.Table(
+            "{}.{}.ibis_result_{}".format(project, dataset, uuid.uuid4().hex)
+        )
+        # The expiration cleans up after processes that exit before the
+        # table is deleted. Overwriting the table's data keeps it.
+        table.expires = datetime.datetime.now(
+            datetime.timezone.utc
+        ) + datetime.timedelta(seconds=self.scratch_table_ttl)
+        table = self.client.create_table(table)
+        try:
+            yield "{}.{}.{}".format(table.project, table.dataset_id, table.table_id)
+        finally:
+            self.client.delete_table(table, not_found_ok=True)
+
+    def _execute_cached(self, expr, params, limit, string_dictionary=False, **kwargs):
+        kwargs.pop("timecontext", None)
+        query_ast, sql, record = self._compile_expr(expr, params, limit)
+        # In a session the temporary functions are defined separately from
+        # `sql`, which only calls them by name, so their bodies are part of
+        # the key.
+        definitions = (
+            [query.compile() for query in query_ast.setup_queries]
+            if self.session
+            else ()
+        )
+        key = self._result_cache_key(sql, params, definitions)
+        table = self.result_cache.get(key)
+        if table is None:
+            cursor = self._execute(
+                sql,
+                query_parameters=self._query_parameters(params),
+                record=record,
+                **kwargs,
+            )
+            table = self._fetch_arrow_from_cursor(cursor)
+            self.result_cache.put(key, table)
+        return self._result_from_arrow(
+            table, query_ast, record, string_dictionary=string_dictionary
+        )
+
+    def _result_cache_key(self, sql, params, definitions=()):
+        query_parameters = self._query_parameters(params)
+        # The dry run lists the tables the query reads, including those
+        # referenced by views and raw SQL. Their metadata is fetched directly,
+        # bypassing the metadata cache, so that changes are always noticed.
+        job = self._submit(sql, query_parameters=query_parameters, dry_run=True)
+        table_versions = [
+            (
+                "{}.{}.{}".format(ref.project, ref.dataset_id, ref.table_id),
+                self.client.get_table(ref).modified,
+            )
+            for ref in job.referenced_tables
+        ]
+        return result_cache_key(
+            sql,
+            [param.to_api_repr() for param in query_parameters],
+            table_versions,
+            definitions,
+        )
+
+    def submit(self, expr, params=None, limit="default"):
+        """Start executing an expression without waiting for it to finish.
+
+        Parameters
+        ----------
+        expr : Expr
+        params : Mapping[ScalarParameter, Any]
+        limit : int, default None
+          For expressions yielding result yets; retrieve at most this number of
+          values/rows. Overrides any limit already set on the expression.
+
+        Returns
+        -------
+        QueryHandle
+          A handle on the running query job. Its ``result()`` method, or
+          awaiting the handle, returns the same object as :meth:`execute`.
+
+        Examples
+        --------
+        >>> handles = [con.submit(expr) for expr in exprs]  # doctest: +SKIP
+        >>> results = [handle.result() for handle in handles]  # doctest: +SKIP
+        """
+        query_ast, sql, record = self._compile_expr(expr, params, limit)
+        query = self._submit(
+            sql, query_parameters=self._query_parameters(params), record=record
+        )
+        return QueryHandle(
+            query,
+            functools.partial(
+                self._fetch_job_result, query_ast=query_ast, record=record
+            ),
+        )
+
+    def execute_many(
+        self,
+        exprs,
+        params=None,
+        limit="default",
+        max_concurrency: Optional[int] = None,
+        fail_fast: bool = True,
+    ) -> list:
+        """Execute several expressions concurrently.
+
+        All expressions are compiled up front, then up to `max_concurrency`
+        query jobs run at the same time. Running jobs are polled together
+        and their results are downloaded as they finish.
+
+        Parameters
+        ----------
+        exprs : Sequence[Expr]
+        params : Mapping[ScalarParameter, Any]
+          Parameter values shared by all expressions.
+        limit : int, default None
+          For expressions yielding result yets; retrieve at most this number of
+          values/rows. Overrides any limit already set on the expression.
+        max_concurrency : int, optional
+          Maximum number of jobs running at the same time. All jobs are
+          submitted at once if not set.
+        fail_fast : bool
+          If ``True``, raise the first error and cancel the jobs that are
+          still running. Otherwise, run every expression and return the
+          exception in place of the result of each one that failed.
+
+        Returns
+        -------
+        list
+          The results of the expressions, in the order of `exprs`.
+        """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError(
+                "max_concurrency must be positive, got {}".format(max_concurrency)
+            )
+
+        compiled = [self._compile_expr(expr, params, limit) for expr in exprs]
+        query_parameters = self._query_parameters(params)
+        results = [None] * len(compiled)
+        pending = collections.deque(enumerate(compiled))
+        running = {}
+        delays = poll_delays()
+
+        try:
+            while pending or running:
+                while pending and (
+                    max_concurrency is None or len(running) < max_concurrency
+                ):
+                    i, (query_ast, sql, record) = pending.popleft()
+                    try:
+                        query = self._submit(
+                            sql, query_parameters=query_parameters, record=record
+                        )
+                    except Exception as exc:
+                        if fail_fast:
+                            raise
+                        results[i] = exc
+                        continue
+                    running[i] = QueryHandle(
+                        query,
+                        functools.partial(
+                            self._fetch_job_result,
+                            query_ast=query_ast,
+                            record=record,
+                        ),
+                    )
+
+                finished = [i for i, handle in running.items() if handle.done()]
+                for i in finished:
+                    handle = running.pop(i)
+                    try:
+                        results[i] = handle.result()
+                    except Exception as exc:
+                        if fail_fast:
+                            raise
+                        results[i] = exc
+
+                if finished:
+                    delays = poll_delays()
+                elif running:
+                    time.sleep(next(delays))
+        finally:
+            for handle in running.values():
+                handle.cancel()
+
+        return results
+
+    def estimate(
+        self,
+        expr,
+        params=None,
+        limit="default",
+        price_per_tib: float = ON_DEMAND_PRICE_PER_TIB,
+    ) -> QueryEstimate:
+        """Estimate the cost of executing an expression without running it.
+
+        The expression is compiled as :meth:`execute` would and submitted as
+        a dry run query, which is free.
+
+        Parameters
+        ----------
+        expr : Expr
+        params : Mapping[ScalarParameter, Any]
+        limit : int, default None
+          For expressions yielding result yets; retrieve at most this number of
+          values/rows. Overrides any limit already set on the expression.
+        price_per_tib : float
+          On-demand price of one TiB processed, in US dollars. Defaults to the
+          price in the US multi-region.
+
+        Returns
+        -------
+        QueryEstimate
+        """
+        _, sql, _ = self._compile_expr(expr, params, limit)
+        job = self._submit(
+            sql, query_parameters=self._query_parameters(params), dry_run=True
+        )
+        return estimate_from_dry_run(job, price_per_tib=price_per_tib)
+
+    async def execute_async(
+        self, expr, params=None, limit="default", timeout: Optional[float] = None
+    ):
+        """Execute an expression without blocking the event loop.
+
+        See :meth:`execute` for a description of the parameters and results.
+        Unlike :meth:`execute`, the `timeout` includes downloading the
+        results. Cancelling the task running this coroutine cancels the
+        query job.
+        """
+        # Compiling, deploying UDFs and submitting the job make blocking
+        # API requests.
+        loop = asyncio.get_running_loop()
+        handle = await loop.run_in_executor(
+            None, functools.partial(self.submit, expr, params=params, limit=limit)
+        )
+        if timeout is None:
+            timeout = self.job_timeout
+        return await asyncio.wait_for(handle, timeout)
+
+    def to_pyarrow(self, expr, params=None, limit="default", **kwargs):
+        """Execute an expression and return the results as Arrow data.
+
+        Results are downloaded with the BigQuery Storage Read API, or the
+        REST API for small results, and are not converted to pandas.
+
+        Parameters
+        ----------
+        expr : Expr
+        params : Mapping[ScalarParameter, Any]
+        limit : int, default None
+          For expressions yielding result yets; retrieve at most this number of
+          values/rows. Overrides any limit already set on the expression.
+
+        Returns
+        -------
+        output : input type dependent
+          Table expressions: pyarrow.Table
+          Array expressions: pyarrow.ChunkedArray
+          Scalar expressions: pyarrow.Scalar
+        """
+        _, cursor = self._run_expr(expr, params, limit, **kwargs)
+        table = self._fetch_arrow_from_cursor(cursor)
+
+        if isinstance(expr, ir.ScalarExpr):
+            return table.column(0)[0]
+        elif isinstance(expr, ir.ColumnExpr):
+            return table.column(0)
+        return table
+
+    def to_pyarrow_batches(
+        self, expr, params=None, limit=None, chunk_size=1_000_000, **kwargs
+    ):
+        """Execute an expression and stream the results as record batches.
+
+        The query runs when this method is called; results are then read
+        lazily with the BigQuery Storage Read API as the returned iterator is
+        consumed, so memory use is bounded by `chunk_size` rather than by the
+        size of the result. Breaking out of the loop stops the download.
+
+        Parameters
+        ----------
+        expr : Expr
+        params : Mapping[ScalarParameter, Any]
+        limit : int, default None
+          For expressions yielding result yets; retrieve at most this number of
+          values/rows. Unlike :meth:`execute`, all rows are streamed by
+          default; ``"default"`` applies ``ibis.options.sql.default_limit``.
+        chunk_size : int
+          Maximum number of rows in each record batch.
+
+        Returns
+        -------
+        Iterator[pyarrow.RecordBatch]
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive, got {}".format(chunk_size))
+        _, cursor = self._run_expr(expr, params, limit, **kwargs)
+        return self._fetch_arrow_batches_from_cursor(cursor, chunk_size)
+
+    def _compile_expr(self, expr, params, limit):
+        record = QueryRecord()
+        self._emit("compile_start", record)
+        start = time.perf_counter()
+        query_ast, sql = self._compile_cached(expr, params, limit)
+        self._deploy_udfs(expr)
+        if self.session:
+            sql = self._define_in_session(query_ast, sql)
+        record.compile_seconds = time.perf_counter() - start
+        record.sql = sql
         self._log(sql)
-        cursor = self.raw_sql(sql, params=params, **kwargs)
-        schema = self.ast_schema(query_ast, **kwargs)
-        result = self.fetch_from_cursor(cursor, schema)
+        self._emit("compile_end", record)
+        return query_ast, sql, record
+
+    def _compile_cached(self, expr, params, limit):
+        key = compile_cache_key(expr, limit=limit, params=params)
+        compiled = None if key is None else self.compile_cache.get(key)
+        if compiled is None:
+            query_ast = self.compiler.to_ast_ensure_limit(expr, limit, params=params)
+            compiled = query_ast, query_ast.compile()
+            if key is not None:
+                self.compile_cache[key] = compiled
+        return compiled
+
+    def compile(self, expr, limit=None, params=None, **kwargs):
+        """Compile an expression to BigQuery SQL.
+
+        Compiled queries are cached; see :attr:`Backend.compile_cache`.
+
+        Returns
+        -------
+        compiled : str
+        """
+        _, sql = self._compile_cached(expr, params, limit)
+        return sql
+
+    def _deploy_udfs(self, expr):
+        """Create the persistent UDFs called in `expr` that may not exist."""
+        for definition in persistent_udf_definitions(expr):
+            if definition not in self._deployed_udfs:
+                # Concurrent deployments are harmless, the DDL is
+                # CREATE FUNCTION IF NOT EXISTS.
+                self.raw_sql(definition)
+                self._deployed_udfs.add(definition)
+
+    def _define_in_session(self, query_ast, sql):
+        """Create the temporary functions of `query_ast` in the session.
+
+        Returns the SQL of the query without the function definitions.
+        """
+        definitions = [query.compile() for query in query_ast.setup_queries]
+        if not definitions:
+            return sql
+        # The compiled SQL is the definitions followed by the query, as
+        # joined by QueryContext.collapse.
+        prefix = query_ast.context.collapse(definitions)
+        if sql.startswith(prefix):
+            body = sql[len(prefix) :].lstrip()
+        else:
+            body = query_ast.dml.compile()
+
+        with self._session_lock:
+            session_id = self._session_id
+            try:
+                self._define_pending(definitions, query_ast.context.collapse)
+            except Exception as exc:
+                if session_id is None or not is_session_expired(exc):
+                    raise
+                self._renew_session(session_id)
+                self._define_pending(definitions, query_ast.context.collapse)
+        return body
+
+    def _define_pending(self, definitions, collapse):
+        # Must be called with the session lock held.
+        pending = [
+            definition
+            for definition in definitions
+            if definition not in self._session_definitions
+        ]
+        if pending:
+            query = self._submit(
+                collapse(pending), create_session=self._session_id is None
+            )
+            query.result()
+            if self._session_id is None:
+                self._session_id = query.session_info.session_id
+            self._session_definitions.update(dict.fromkeys(pending))
+
+    def _renew_session(self, expired_session_id):
+        """Replace an expired session by a new one with the same functions."""
+        with self._session_lock:
+            if self._session_id != expired_session_id:
+                # Another thread already renewed it.
+                return
+            definitions = list(self._session_definitions)
+            self._session_id = None
+            self._session_definitions.clear()
+            if definitions:
+                # Statements are joined as by QueryContext.collapse.
+                self._define_pending(definitions, "\n\n".join)
+
+    def _in_session(self, attempt):
+        # Run attempt again, once, if the session it used has expired.
+        session_id = self._session_id if self.session else None
+        try:
+            return attempt()
+        except Exception as exc:
+            if session_id is None or not is_session_expired(exc):
+                raise
+            self._renew_session(session_id)
+            return attempt()
+
+    def close_session(self):
+        """End the BigQuery session used with ``connect(session=True)``.
+
+        The temporary functions created in the session are dropped. A new
+        session is started by the next query that needs one.
+        """
+        with self._session_lock:
+            if self._session_id is None:
+                return
+            try:
+                self._submit("CALL BQ.ABORT_SESSION()").result()
+            except Exception as exc:
+                if not is_session_expired(exc):
+                    raise
+            finally:
+                self._session_id = None
+                self._session_definitions.clear()
+
+    def _run_expr(self, expr, params, limit, **kwargs):
+        # TODO: upstream needs to pass params to raw_sql, I think.
+        kwargs.pop("timecontext", None)
+        query_ast, sql, record = self._compile_expr(expr, params, limit)
+        cursor = self._execute(
+            sql,
+            query_parameters=self._query_parameters(params),
+            record=record,
+            **kwargs,
+        )
+        return query_ast, cursor
+
+    def _fetch_job_result(self, cursor, query_ast, record):
+        self._job_done(cursor.query, record)
+        cursor.record = record
+        return self._fetch_result(cursor, query_ast)
+
+    def _fetch_result(self, cursor, query_ast, string_dictionary=False):
+        return self._result_from_arrow(
+            self._fetch_arrow_from_cursor(cursor),
+            query_ast,
+            cursor.record,
+            string_dictionary=string_dictionary,
+        )
+
+    def _result_from_arrow(
+        self, table, query_ast, record=None, string_dictionary=False
+    ):
+        schema = string_dictionary_schema(self.ast_schema(query_ast), string_dictionary)
+        result = self._arrow_to_frame(table, schema, record)
 
         if hasattr(getattr(query_ast, "dml", query_ast), "result_handler"):
             result = query_ast.dml.result_handler(result)
@@ -347,28 +1318,396 @@ class Backend(BaseSQLBackend):
         else:
             return True
 
+    def _storage_reader(self, cursor):
+        query = cursor.query
+        if query.destination is None:
+            # Scripts and DDL statements don't have a destination table to
+            # read from, and their results are small.
+            return None
+        total_rows = cursor.result.total_rows
+        if total_rows is not None and total_rows <= REST_READ_MAX_ROWS:
+            return None
+        reader = BigQueryStorageReader(
+            self.storage_client,
+            query.destination,
+            self.billing_project,
+            parallelism=self.read_parallelism,
+            preserve_order=contains_order_by(query.query),
+        )
+        try:
+            reader.session  # created here so that failures can fall back
+        except PermissionDenied as exc:
+            warnings.warn(
+                "Can't read results with the BigQuery Storage API, "
+                "downloading them with the REST API instead: {}".format(exc)
+            )
+            return None
+        return reader
+
+    def _rest_arrow(self, cursor):
+        if cursor.query.destination is None:
+            return cursor.query.to_arrow(bqstorage_client=self.storage_client)
+        return cursor.result.to_arrow(create_bqstorage_client=False)
+
+    def _fetch_arrow_from_cursor(self, cursor):
+        start = time.perf_counter()
+        reader = self._storage_reader(cursor)
+        if reader is None:
+            table = self._rest_arrow(cursor)
+        else:
+            table = reader.read_all()
+        self._fetch_done(cursor, time.perf_counter() - start)
+        return table
+
+    def _fetch_arrow_batches_from_cursor(self, cursor, chunk_size):
+        reader = self._storage_reader(cursor)
+        if reader is None:
+            batches = iter(self._rest_arrow(cursor).to_batches())
+        else:
+            batches = reader.read_batches()
+        return rechunk_arrow_batches(self._timed_batches(cursor, batches), chunk_size)
+
+    def _timed_batches(self, cursor, batches):
+        # Only count the time spent waiting for batches, not the time the
+        # consumer spends processing them.
+        elapsed = 0.0
+        while True:
+            start = time.perf_counter()
+            batch = next(batches, None)
+            elapsed += time.perf_counter() - start
+            if batch is None:
+                break
+            yield batch
+        self._fetch_done(cursor, elapsed)
+
+    def _fetch_done(self, cursor, seconds):
+        record = cursor.record
+        if record is not None:
+            record.download_seconds = seconds
+            self._emit("fetch_done", record)
+
     def fetch_from_cursor(self, cursor, schema):
-        df = cursor.query.to_dataframe()
-        return schema.apply_to(df)
+        return self._arrow_to_frame(
+            self._fetch_arrow_from_cursor(cursor), schema, cursor.record
+        )
+
+    def _arrow_to_frame(self, table, schema, record=None):
+        start = time.perf_counter()
+        column_seconds = {}
+        df = arrow_to_pandas(table, schema, column_seconds=column_seconds)
+        if record is not None:
+            record.conversion_seconds = time.perf_counter() - start
+            record.column_conversion_seconds = column_seconds
+            self._emit("convert_done", record)
+        return df
 
     def get_schema(self, name, database=None):
         table_id = self._fully_qualified_name(name, database)
-        table_ref = bq.TableReference.from_string(table_id)
-        bq_table = self.client.get_table(table_ref)
+        bq_table = self._get_bq_table(table_id)
         return sch.infer(bq_table)
 
-    def list_databases(self, like=None):
-        results = [
-            dataset.dataset_id
-            for dataset in self.client.list_datasets(project=self.data_project)
-        ]
-        return self._filter_with_like(results, like)
+    def create_table(
+        self,
+        name: str,
+        obj=None,
+        schema: Optional[sch.Schema] = None,
+        database: Optional[str] = None,
+        chunk_size: int = 1_000_000,
+        max_concurrency: Optional[int] = None,
+    ) -> None:
+        """Create a table, optionally filled with data.
+
+        Local data is uploaded with Parquet load jobs, see :meth:`insert`.
+
+        Parameters
+        ----------
+        name : str
+            Name of the new table.
+        obj : pandas.DataFrame, pyarrow.Table or TableExpr, optional
+            Data of the new table. If not given, `schema` must be, and the
+            table is created empty.
+        schema : ibis.Schema, optional
+            Schema of the new table. Defaults to the schema of `obj`. The
+            schema of a pyarrow Table is derived by BigQuery from its
+            Parquet serialization.
+        database : str, optional
+            A dataset or ``"project.dataset"``. Defaults to the current
+            dataset.
+        chunk_size : int
+            Maximum number of rows uploaded by each load job.
+        max_concurrency : int, optional
+            Maximum number of load jobs running at the same time.
+        """
+        if obj is None and schema is None:
+            raise ValueError("Either obj or schema must be given")
+        table_id = self._fully_qualified_name(name, database)
+
+        if isinstance(obj, ir.TableExpr):
+            self._insert_expr(table_id, obj, bq.WriteDisposition.WRITE_EMPTY)
+        else:
+            if schema is None and isinstance(obj, pd.DataFrame):
+                schema = sch.infer(obj)
+            fields = None
+            if schema is not None:
+                fields = ibis_schema_to_bigquery_schema(schema)
+                self.client.create_table(bq.Table(table_id, schema=fields))
+            if obj is not None:
+                self._load(
+                    table_id,
+                    obj,
+                    bq.WriteDisposition.WRITE_APPEND
+                    if schema is not None
+                    else bq.WriteDisposition.WRITE_EMPTY,
+                    chunk_size=chunk_size,
+                    max_concurrency=max_concurrency,
+                    fields=fields,
+                )
+        self.invalidate(name, database)
+        self._name_cache.clear()
+
+    def insert(
+        self,
+        name: str,
+        obj,
+        database: Optional[str] = None,
+        overwrite: bool = False,
+        chunk_size: int = 1_000_000,
+        max_concurrency: Optional[int] = None,
+    ) -> None:
+        """Insert data into an existing table.
+
+        Local data is serialized to Parquet in chunks of `chunk_size` rows,
+        which are uploaded by concurrent load jobs. Load jobs are free and
+        much faster than streaming inserts. If a job fails, the chunks that
+        were already loaded are not removed. Timestamp columns are cast to
+        the ``TIMESTAMP`` or ``DATETIME`` type of the table's columns.
+
+        Parameters
+        ----------
+        name : str
+            Name of the table.
+        obj : pandas.DataFrame, pyarrow.Table or TableExpr
+            Data to insert.
+        database : str, optional
+            A dataset or ``"project.dataset"``. Defaults to the current
+            dataset.
+        overwrite : bool
+            Replace the data of the table instead of appending to it.
+        chunk_size : int
+            Maximum number of rows uploaded by each load job.
+        max_concurrency : int, optional
+            Maximum number of load jobs running at the same time.
+        """
+        table_id = self._fully_qualified_name(name, database)
+        write_disposition = (
+            bq.WriteDisposition.WRITE_TRUNCATE
+            if overwrite
+            else bq.WriteDisposition.WRITE_APPEND
+        )
+        if isinstance(obj, ir.TableExpr):
+            self._insert_expr(table_id, obj, write_disposition)
+        else:
+            self._load(
+                table_id,
+                obj,
+                write_disposition,
+                chunk_size=chunk_size,
+                max_concurrency=max_concurrency,
+                fields=self._get_bq_table(table_id).schema,
+            )
+        self.invalidate(name, database)
+
+    def append_stream(
+        self,
+        name: str,
+        database: Optional[str] = None,
+        max_in_flight: int = 8,
+        pending: bool = False,
+    ) -> BigQueryStorageWriter:
+        """Open a writer streaming data into an existing table.
+
+        The writer uses the BigQuery Storage Write API, which suits many
+        small appends better than load jobs. See
+        :class:`~ibis_bigquery.client.BigQueryStorageWriter`.
+
+        Parameters
+        ----------
+        name : str
+            Name of the table.
+        database : str, optional
+            A dataset or ``"project.dataset"``. Defaults to the current
+            dataset.
+        max_in_flight : int
+            Maximum number of appends sent without being acknowledged.
+        pending : bool
+            Make all appended rows visible at once when the writer is
+            closed, instead of as soon as each append is acknowledged.
+
+        Returns
+        -------
+        BigQueryStorageWriter
+
+        Raises
+        ------
+        ibis.common.exceptions.UnsupportedOperationError
+            If the installed google-cloud-bigquery-storage can't append Arrow
+            data.
+        """
+        if not HAS_ARROW_WRITES:
+            raise com.UnsupportedOperationError(
+                "append_stream requires a version of google-cloud-bigquery-storage "
+                "that supports Arrow data in the Storage Write API, "
+                "got {}".format(bigquery_storage.__version__)
+            )
+        project, dataset, table = self._fully_qualified_name(name, database).split(".")
+        if self.write_client is None:
+            self.write_client = bigquery_storage.BigQueryWriteClient(
+                credentials=self._credentials,
+                client_info=_create_client_info_gapic(self._application_name),
+            )
+        self.invalidate(name, database)
+        return BigQueryStorageWriter(
+            self.write_client,
+            "projects/{}/datasets/{}/tables/{}".format(project, dataset, table),
+            max_in_flight=max_in_flight,
+            pending=pending,
+        )
+
+    def _insert_expr(self, table_id, expr, write_disposition):
+        _, sql, record = self._compile_expr(expr, None, None)
+        self._execute(
+            sql,
+            destination=table_id,
+            write_disposition=write_disposition,
+            record=record,
+        )
 
-    def list_tables(self, like=None, database=None):
+    def _load(
+        self, table_id, obj, write_disposition, chunk_size, max_concurrency, fields
+    ):
+        if isinstance(obj, pd.DataFrame):
+            obj = pa.Table.from_pandas(obj, preserve_index=False)
+        elif not isinstance(obj, pa.Table):
+            raise TypeError(
+                "Expected a pandas DataFrame, a pyarrow Table or a table "
+                "expression, got {}".format(type(obj).__name__)
+            )
+        load_arrow_table(
+            self.client,
+            obj,
+            table_id,
+            write_disposition,
+            chunk_size=chunk_size,
+            max_workers=max_concurrency,
+            project=self.billing_project,
+            schema=fields,
+        )
+
+    def list_databases(
+        self,
+        like: Optional[str] = None,
+        page_size: Optional[int] = None,
+        location: Optional[str] = None,
+    ) -> List[str]:
+        """List the datasets of the current project.
+
+        Names are cached for ``table_cache_ttl`` seconds, see
+        :meth:`Backend.connect`.
+
+        Parameters
+        ----------
+        like : str, optional
+            Only list datasets whose name contains a match of this regular
+            expression.
+        page_size : int, optional
+            Number of names fetched per request.
+        location : str, optional
+            The location of the datasets, such as ``"US"`` or
+            ``"europe-west1"``. If given with `like`, the datasets are
+            filtered by BigQuery with a query of the location's
+            ``INFORMATION_SCHEMA.SCHEMATA`` view, which only lists the
+            datasets in that location.
+        """
+        key = ("databases", self.data_project, like, location, page_size)
+        names = self._name_cache.get(key)
+        if names is not None:
+            return list(names)
+
+        if like is not None and location is not None:
+            names = self._query_names(
+                "SELECT schema_name FROM "
+                "`{}`.`region-{}`.INFORMATION_SCHEMA.SCHEMATA "
+                "WHERE REGEXP_CONTAINS(schema_name, @pattern) "
+                "ORDER BY schema_name".format(self.data_project, location.lower()),
+                like,
+                page_size,
+            )
+        else:
+            names = self._filter_with_like(
+                [
+                    dataset.dataset_id
+                    for dataset in self.client.list_datasets(
+                        project=self.data_project, page_size=page_size
+                    )
+                ],
+                like,
+            )
+        self._name_cache[key] = names
+        return list(names)
+
+    def list_tables(
+        self,
+        like: Optional[str] = None,
+        database: Optional[str] = None,
+        page_size: Optional[int] = None,
+    ) -> List[str]:
+        """List the tables of a dataset.
+
+        Names are cached for ``table_cache_ttl`` seconds, see
+        :meth:`Backend.connect`.
+
+        Parameters
+        ----------
+        like : str, optional
+            Only list tables whose name contains a match of this regular
+            expression. The pattern is applied by BigQuery with a query of
+            the dataset's ``INFORMATION_SCHEMA.TABLES`` view, so only the
+            matching names are downloaded. BigQuery uses the RE2 syntax.
+        database : str, optional
+            A dataset or ``"project.dataset"``. Defaults to the current
+            dataset.
+        page_size : int, optional
+            Number of names fetched per request.
+        """
         project, dataset = self._parse_project_and_dataset(database)
-        dataset_ref = bq.DatasetReference(project, dataset)
-        result = [table.table_id for table in self.client.list_tables(dataset_ref)]
-        return self._filter_with_like(result, like)
+        key = ("tables", project, dataset, like, page_size)
+        names = self._name_cache.get(key)
+        if names is not None:
+            return list(names)
+
+        if like is not None:
+            names = self._query_names(
+                "SELECT table_name FROM `{}.{}`.INFORMATION_SCHEMA.TABLES "
+                "WHERE REGEXP_CONTAINS(table_name, @pattern) "
+                "ORDER BY table_name".format(project, dataset),
+                like,
+                page_size,
+            )
+        else:
+            dataset_ref = bq.DatasetReference(project, dataset)
+            names = [
+                table.table_id
+                for table in self.client.list_tables(dataset_ref, page_size=page_size)
+            ]
+        self._name_cache[key] = names
+        return list(names)
+
+    def _query_names(self, sql, pattern, page_size):
+        cursor = self._execute(
+            sql,
+            query_parameters=[bq.ScalarQueryParameter("pattern", "STRING", pattern)],
+        )
+        return [row[0] for row in cursor.query.result(page_size=page_size)]
 
     def set_database(self, name):
         self.data_project, self.dataset = self._parse_project_and_dataset(name)
@@ -378,6 +1717,9 @@ class Backend(BaseSQLBackend):
         return bq.__version__
 
 
+_compile_backend = Backend()
+
+
 def compile(expr, params=None, **kwargs):
     """Compile an expression for BigQuery.
     Returns
@@ -387,8 +1729,7 @@ def compile(expr, params=None, **kwargs):
     --------
     ibis.expr.types.Expr.compile
     """
-    backend = Backend()
-    return backend.compile(expr, params=params, **kwargs)
+    return _compile_backend.compile(expr, params=params, **kwargs)
 
 
 def connect(
@@ -400,6 +1741,20 @@ def connect(
     auth_external_data: bool = False,
     auth_cache: str = "default",
     partition_column: Optional[str] = "PARTITIONTIME",
+    read_parallelism: Optional[int] = None,
+    table_cache_size: int = 128,
+    table_cache_ttl: Optional[float] = 60.0,
+    result_cache_dir: Optional[str] = None,
+    result_cache_max_bytes: int = 2**30,
+    scratch_dataset: Optional[str] = None,
+    scratch_table_ttl: float = 24 * 60 * 60,
+    maximum_bytes_billed: Optional[int] = None,
+    check_bytes_billed: bool = False,
+    query_log_size: int = 100,
+    job_timeout: Optional[float] = None,
+    retry_policy: Optional[RetryPolicy] = None,
+    batch_concurrency: int = 4,
+    session: bool = False,
 ) -> Backend:
     """Create a :class:`Backend` for use with Ibis.
 
@@ -442,6 +1797,65 @@ def connect(
     partition_column : str
         Identifier to use instead of default ``_PARTITIONTIME`` partition
         column. Defaults to ``'PARTITIONTIME'``.
+    read_parallelism : int, optional
+        Maximum number of BigQuery Storage API streams used to download
+        query results, each read on its own thread. If not set, BigQuery
+        chooses the number of streams, and they are read by at most
+        ``min(32, os.cpu_count() + 4)`` threads. Results of queries with
+        an ``ORDER BY`` are always read through a single stream.
+    table_cache_size : int
+        Maximum number of tables whose metadata is kept in memory.
+    table_cache_ttl : float, optional
+        Number of seconds table metadata and the names listed by
+        ``list_tables`` and ``list_databases`` are cached for. Cached
+        metadata never expires if set to ``None``. Use
+        :meth:`Backend.invalidate` to refresh a table whose schema has
+        changed, or :meth:`Backend.clear_cache`.
+    result_cache_dir : str, optional
+        Directory in which to cache the results of :meth:`Backend.execute`
+        as Arrow files. Results are reused when the compiled query, its
+        parameter values and the last modified time of every table it
+        reads are unchanged. Checking the tables costs a dry run and a
+        metadata request per table on each call. Don't enable this for
+        queries whose results depend on the time they run, such as
+        those using ``CURRENT_TIMESTAMP()``. Disabled if not set.
+    result_cache_max_bytes : int
+        Maximum total size of the cached results. The least recently
+        used results are deleted when it is exceeded.
+    scratch_dataset : str, optional
+        A ``<project>.<dataset>`` or ``<dataset>`` in which to create the
+        temporary result tables of ``execute(..., large_results=True)``.
+    scratch_table_ttl : float
+        Number of seconds after which BigQuery deletes a temporary result
+        table, if it wasn't already deleted after reading it.
+    maximum_bytes_billed : int, optional
+        Limit on the bytes billed for each query. BigQuery fails queries
+        that would bill more, without charging for them. No limit is set
+        if not given.
+    check_bytes_billed : bool
+        Estimate the bytes processed by each query with a dry run before
+        running it, and raise :class:`MaximumBytesBilledExceeded` if the
+        estimate is over `maximum_bytes_billed`.
+    query_log_size : int
+        Number of recent queries kept in :attr:`Backend.query_log`.
+    job_timeout : float, optional
+        Number of seconds to wait for each query job to finish before
+        cancelling it. Where the installed google-cloud-bigquery supports
+        it, BigQuery is also asked to stop the job after this long.
+    retry_policy : RetryPolicy, optional
+        Resubmit query jobs that fail with transient errors, such as rate
+        limits, according to this policy. Failed jobs aren't retried if
+        not given.
+    batch_concurrency : int
+        Maximum number of queries executed with ``priority="BATCH"``
+        running at the same time. Other batch queries wait in
+        :attr:`Backend.batch_scheduler`.
+    session : bool
+        Run queries in a BigQuery session. The temporary functions
+        defined by UDFs are then created once per session instead of
+        being sent with every query that calls them. A session that
+        has expired is replaced by a new one with the same functions.
+        Requires google-cloud-bigquery 2.29 or later.
 
     Returns
     -------
@@ -458,12 +1872,28 @@ def connect(
         auth_external_data=auth_external_data,
         auth_cache=auth_cache,
         partition_column=partition_column,
+        read_parallelism=read_parallelism,
+        table_cache_size=table_cache_size,
+        table_cache_ttl=table_cache_ttl,
+        result_cache_dir=result_cache_dir,
+        result_cache_max_bytes=result_cache_max_bytes,
+        scratch_dataset=scratch_dataset,
+        scratch_table_ttl=scratch_table_ttl,
+        maximum_bytes_billed=maximum_bytes_billed,
+        check_bytes_billed=check_bytes_billed,
+        query_log_size=query_log_size,
+        job_timeout=job_timeout,
+        retry_policy=retry_policy,
+        batch_concurrency=batch_concurrency,
+        session=session,
     )
 
 
 __all__ = [
     "__version__",
     "Backend",
+    "MaximumBytesBilledExceeded",
+    "RetryPolicy",
     "compile",
     "connect",
 ]
@@ -0,0 +1,231 @@
+"""Caches used by the BigQuery backend."""
+
+import glob
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+import pyarrow as pa
+
+_MISSING = object()
+
+
+class CacheInfo(NamedTuple):
+    """Usage statistics of an :class:`LRUCache`."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+    ttl: Optional[float]
+
+
+class LRUCache:
+    """A thread-safe mapping that keeps the most recently used entries.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of entries. The least recently used entry is evicted
+        when a new one would exceed it.
+    ttl : float, optional
+        Number of seconds after which an entry expires. Entries never expire
+        if not set.
+
+    """
+
+    def __init__(self, maxsize=128, ttl=None):
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive, got {}".format(maxsize))
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._lookup(key) is not _MISSING
+
+    def _lookup(self, key):
+        try:
+            value, expires = self._data[key]
+        except KeyError:
+            return _MISSING
+        if expires is not None and expires <= time.monotonic():
+            del self._data[key]
+            return _MISSING
+        return value
+
+    def get(self, key, default=None):
+        """Return the value for `key` and mark it as recently used."""
+        with self._lock:
+            value = self._lookup(key)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._data.move_to_end(key)
+            return value
+
+    def __setitem__(self, key, value):
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            self._data[key] = value, expires
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """Remove `key` and return its value, or `default` if it is missing."""
+        with self._lock:
+            value, _ = self._data.pop(key, (default, None))
+            return value
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def info(self):
+        """Return the hit and miss counts and the size of the cache."""
+        with self._lock:
+            return CacheInfo(
+                self.hits, self.misses, self.maxsize, len(self._data), self.ttl
+            )
+
+
+def result_cache_key(sql, query_parameters, table_versions, definitions=()):
+    """Return a key identifying the results of a query.
+
+    Parameters
+    ----------
+    sql : str
+        The compiled query.
+    query_parameters : List[dict]
+        The API representation of the query parameters.
+    table_versions : List[Tuple[str, str]]
+        The fully qualified name and last modified time of each table the
+        query reads, so that results are invalidated when a table changes.
+    definitions : List[str], optional
+        The SQL of the temporary functions the query calls when they are
+        defined separately, in a session, rather than as part of `sql`.
+
+    Returns
+    -------
+    str
+
+    """
+    payload = json.dumps(
+        [sql, query_parameters, sorted(table_versions), list(definitions)],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """An on-disk cache of query results stored as Arrow IPC files.
+
+    Cached tables are memory-mapped when read back. When the files in the
+    cache exceed `max_bytes`, the least recently used ones are deleted.
+
+    Parameters
+    ----------
+    directory : str
+        Directory holding the cached results. It is created if it doesn't
+        exist.
+    max_bytes : int
+        Maximum total size of the cached results.
+
+    """
+
+    suffix = ".arrow"
+
+    def __init__(self, directory, max_bytes=2**30):
+        self.directory = os.path.expanduser(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + self.suffix)
+
+    def get(self, key):
+        """Return the cached :class:`pyarrow.Table` for `key`, if any."""
+        path = self._path(key)
+        try:
+            table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+            # The modification time orders entries for eviction.
+            os.utime(path)
+        except FileNotFoundError:
+            table = None
+        except (OSError, pa.ArrowInvalid):
+            # A file that can't be read is dropped rather than served.
+            self._remove(path)
+            table = None
+
+        with self._lock:
+            if table is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return table
+
+    def put(self, key, table):
+        """Store `table` under `key`, evicting old entries if needed."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            if os.path.getsize(tmp_path) > self.max_bytes:
+                return
+            # Readers never see a partially written file.
+            os.replace(tmp_path, self._path(key))
+        finally:
+            self._remove(tmp_path)
+        self._evict()
+
+    def clear(self):
+        """Delete all cached results."""
+        for path in self._entries():
+            self._remove(path)
+
+    def _entries(self):
+        return glob.glob(os.path.join(glob.escape(self.directory), "*" + self.suffix))
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            for path in self._entries():
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -1,9 +1,24 @@
 """BigQuery ibis client implementation."""
 
+import asyncio
+import collections
+import concurrent.futures
+import contextlib
 import datetime
+import inspect
+import io
+import itertools
+import os
+import queue
+import random
+import re
+import threading
+import time
 from collections import OrderedDict
-from typing import Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Tuple
 
+import google.api_core.exceptions
 import google.cloud.bigquery as bq
 import ibis
 
@@ -18,7 +33,11 @@ import ibis.expr.operations as ops
 import ibis.expr.schema as sch
 import ibis.expr.types as ir
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from google.api_core.client_info import ClientInfo
+from google.api_core.gapic_v1.client_info import ClientInfo as GapicClientInfo
+from google.cloud import bigquery_storage
 from ibis.backends.base import Database
 from multipledispatch import Dispatcher
 
@@ -52,14 +71,719 @@ _LEGACY_TO_STANDARD = {
 _USER_AGENT_DEFAULT_TEMPLATE = "ibis/{}"
 
 
-def _create_client_info(application_name):
+def _create_user_agent(application_name):
     user_agent = []
 
     if application_name:
         user_agent.append(application_name)
 
     user_agent.append(_USER_AGENT_DEFAULT_TEMPLATE.format(ibis.__version__))
-    return ClientInfo(user_agent=" ".join(user_agent))
+    return " ".join(user_agent)
+
+
+def _create_client_info(application_name):
+    return ClientInfo(user_agent=_create_user_agent(application_name))
+
+
+def _create_client_info_gapic(application_name):
+    return GapicClientInfo(user_agent=_create_user_agent(application_name))
+
+
+def _cast_arrow_column(column, dtype):
+    """Cast `column` so that it converts directly to the pandas dtype of the
+    ibis type `dtype`, or return None if it can't or needn't be cast."""
+    arrow_type = column.type
+    if isinstance(dtype, dt.Timestamp) and dtype.timezone is None:
+        if pa.types.is_timestamp(arrow_type) and arrow_type.tz is not None:
+            # Drops the time zone of the UTC values without copying them.
+            return column.cast(pa.timestamp(arrow_type.unit))
+    elif isinstance(dtype, dt.Category) and pa.types.is_string(arrow_type):
+        # Converted to a Categorical, whose categories are the only Python
+        # strings created.
+        return column.dictionary_encode()
+    elif isinstance(dtype, dt.Date) and pa.types.is_date(arrow_type):
+        try:
+            return column.cast(pa.timestamp("ns"))
+        except pa.ArrowInvalid:
+            # Out of the range of datetime64[ns], the dates stay objects.
+            return None
+    return None
+
+
+def _needs_conversion(column, arrow_type, dtype):
+    """Whether the converted `column` must be recast to the ibis type
+    `dtype`, as :meth:`ibis.expr.schema.Schema.apply_to` would."""
+    if isinstance(dtype, (dt.String, dt.Time)):
+        # Strings are already objects, and times can't be recast.
+        return False
+    if arrow_type is None:
+        return False
+    if (
+        isinstance(dtype, dt.Integer)
+        and pa.types.is_integer(arrow_type)
+        and column.dtype.kind == "f"
+    ):
+        # Integers with nulls are converted to floats and can't be recast.
+        return False
+    if isinstance(dtype, dt.Boolean) and column.dtype == object:
+        # Likewise for booleans with nulls, which are converted to objects.
+        return False
+    if isinstance(dtype, dt.Date) and pa.types.is_date(arrow_type):
+        # The dates didn't fit in datetime64[ns] when cast by Arrow.
+        return False
+    if isinstance(dtype, dt.Category) and pa.types.is_dictionary(arrow_type):
+        return False
+    try:
+        return dtype.to_pandas() != column.dtype
+    except TypeError:
+        return True
+
+
+def arrow_to_pandas(table, schema=None, column_seconds=None):
+    """Convert a :class:`pyarrow.Table` of results to a DataFrame.
+
+    The Arrow buffers are released while the columns are converted, so peak
+    memory stays close to the size of the resulting DataFrame rather than
+    twice that.
+
+    Parameters
+    ----------
+    table : pyarrow.Table
+    schema : ibis.Schema, optional
+        Convert the columns to the pandas dtypes of this schema. Columns
+        are cast on the Arrow side where that avoids converting them twice,
+        and only the columns whose dtype differs are recast afterwards.
+    column_seconds : dict, optional
+        Filled with the time spent adapting each column that needed it.
+    """
+    if column_seconds is None:
+        column_seconds = {}
+    arrow_types = {}
+    if schema is not None:
+        for name, dtype in schema.items():
+            index = table.schema.get_field_index(name)
+            if index < 0:
+                continue
+            start = time.perf_counter()
+            column = _cast_arrow_column(table.column(index), dtype)
+            if column is not None:
+                table = table.set_column(index, name, column)
+                column_seconds[name] = time.perf_counter() - start
+            arrow_types[name] = table.schema.field(index).type
+
+    df = table.to_pandas(self_destruct=True)
+    del table
+
+    if schema is not None:
+        for name, dtype in schema.items():
+            column = df[name]
+            if _needs_conversion(column, arrow_types.get(name), dtype):
+                start = time.perf_counter()
+                df[name] = sch.convert(column.dtype, dtype, column)
+                column_seconds[name] = column_seconds.get(name, 0.0) + (
+                    time.perf_counter() - start
+                )
+    return df
+
+
+def bigquery_value_to_scalar(value, dtype):
+    """Convert a value of a result row to the result of a scalar expression.
+
+    The value is converted as if it had been read from a DataFrame of
+    results of type `dtype`: nulls become ``NaN`` or ``NaT`` where pandas
+    would use them, and dates and timestamps become
+    :class:`pandas.Timestamp` objects.
+    """
+    if value is None:
+        if isinstance(dtype, (dt.Integer, dt.Floating)):
+            return float("nan")
+        if isinstance(dtype, (dt.Date, dt.Timestamp)):
+            return pd.NaT
+        return None
+    if isinstance(dtype, dt.Timestamp):
+        value = pd.Timestamp(value)
+        if value.tz is not None:
+            return value.tz_convert(dtype.timezone)
+        if dtype.timezone is not None:
+            return value.tz_localize("UTC").tz_convert(dtype.timezone)
+        return value
+    if isinstance(dtype, dt.Date):
+        return pd.Timestamp(value)
+    return value
+
+
+def string_dictionary_schema(schema, columns=True):
+    """Return `schema` with string columns typed as categories.
+
+    Results converted to pandas with the returned schema have
+    :class:`pandas.Categorical` columns instead of object columns of
+    strings.
+
+    Parameters
+    ----------
+    schema : ibis.Schema
+    columns : bool or Sequence[str]
+        ``True`` for all string columns, or the names of string columns.
+    """
+    if columns is True:
+        columns = [
+            name for name, dtype in schema.items() if isinstance(dtype, dt.String)
+        ]
+    elif not columns:
+        return schema
+    columns = set(columns)
+    for name in columns:
+        if name not in schema:
+            raise ValueError("Unknown column: {}".format(name))
+        if not isinstance(schema[name], dt.String):
+            raise ValueError(
+                "Column {} is of type {}, not string".format(name, schema[name])
+            )
+    return sch.schema(
+        [
+            (name, dt.category if name in columns else dtype)
+            for name, dtype in schema.items()
+        ]
+    )
+
+
+_ORDER_BY_RE = re.compile(r"\bORDER\s+BY\b", re.IGNORECASE)
+
+_STREAM_DONE = object()
+
+
+def contains_order_by(sql):
+    """Return whether the `sql` query may produce ordered results."""
+    return _ORDER_BY_RE.search(sql) is not None
+
+
+# Results of at most this many rows are downloaded with the REST API, which
+# avoids the round trip to create a read session for small results.
+REST_READ_MAX_ROWS = 10_000
+
+
+# Same as the default of ThreadPoolExecutor. BigQuery can return hundreds of
+# streams for a large table.
+DEFAULT_READ_THREADS = min(32, (os.cpu_count() or 1) + 4)
+
+
+class BigQueryStorageReader:
+    """Read a table with the BigQuery Storage Read API.
+
+    The streams of the read session are drained concurrently on a thread
+    pool, with at most one thread per stream.
+
+    Parameters
+    ----------
+    storage_client : google.cloud.bigquery_storage.BigQueryReadClient
+    table_ref : google.cloud.bigquery.TableReference
+        The table to read, usually the destination table of a query job.
+    billing_project : str
+        The project billed for the read session.
+    parallelism : int, optional
+        Maximum number of streams to open and read concurrently. If not set,
+        BigQuery chooses the number of streams, which are read by at most
+        :data:`DEFAULT_READ_THREADS` threads.
+    preserve_order : bool
+        Read the table through a single stream so that rows come back in
+        table order, as required for the results of an ``ORDER BY`` query.
+
+    """
+
+    def __init__(
+        self,
+        storage_client,
+        table_ref,
+        billing_project,
+        parallelism=None,
+        preserve_order=False,
+    ):
+        if parallelism is not None and parallelism < 1:
+            raise ValueError("parallelism must be positive, got {}".format(parallelism))
+        self.storage_client = storage_client
+        self.table_ref = table_ref
+        self.billing_project = billing_project
+        self.parallelism = parallelism
+        self.preserve_order = preserve_order
+        self._session = None
+
+    @property
+    def session(self):
+        """The read session, created on first access."""
+        if self._session is None:
+            if self.preserve_order:
+                max_stream_count = 1
+            else:
+                max_stream_count = self.parallelism or 0
+
+            requested_session = bigquery_storage.types.ReadSession(
+                table=self.table_ref.to_bqstorage(),
+                data_format=bigquery_storage.types.DataFormat.ARROW,
+            )
+            self._session = self.storage_client.create_read_session(
+                parent="projects/{}".format(self.billing_project),
+                read_session=requested_session,
+                max_stream_count=max_stream_count,
+            )
+        return self._session
+
+    @property
+    def schema(self):
+        """The Arrow schema of the table."""
+        serialized_schema = self.session.arrow_schema.serialized_schema
+        return pa.ipc.read_schema(pa.py_buffer(serialized_schema))
+
+    def read_all(self):
+        """Read all streams into a single :class:`pyarrow.Table`.
+
+        Batches are reassembled in stream order, so the result does not
+        depend on which stream finishes first.
+        """
+        streams = self.session.streams
+        if len(streams) <= 1:
+            batches = [batch for s in streams for batch in self._read_stream(s)]
+        else:
+            with ThreadPoolExecutor(max_workers=self._max_workers()) as executor:
+                results = executor.map(
+                    lambda stream: list(self._read_stream(stream)), streams
+                )
+                batches = list(itertools.chain.from_iterable(results))
+        return pa.Table.from_batches(batches, schema=self.schema)
+
+    def read_batches(self):
+        """Iterate over the record batches of all streams.
+
+        With more than one stream, batches are yielded in the order they
+        arrive. At most a couple of batches per thread are buffered, and
+        closing the generator stops all reader threads.
+
+        Yields
+        ------
+        pyarrow.RecordBatch
+
+        """
+        streams = self.session.streams
+        if len(streams) <= 1:
+            for stream in streams:
+                yield from self._read_stream(stream)
+        else:
+            yield from self._read_batches_concurrently(streams)
+
+    def _max_workers(self):
+        num_streams = len(self.session.streams)
+        if self.parallelism is None:
+            return min(num_streams, DEFAULT_READ_THREADS)
+        return min(num_streams, self.parallelism)
+
+    def _read_stream(self, stream):
+        reader = self.storage_client.read_rows(stream.name)
+        try:
+            for page in reader.rows(self.session).pages:
+                yield page.to_arrow()
+        finally:
+            _cancel_read_rows(reader)
+
+    def _read_batches_concurrently(self, streams):
+        max_workers = self._max_workers()
+        results = queue.Queue(maxsize=2 * max_workers)
+        stopped = threading.Event()
+
+        def put(item):
+            while not stopped.is_set():
+                try:
+                    results.put(item, timeout=0.1)
+                except queue.Full:
+                    continue
+                return True
+            return False
+
+        def drain(stream):
+            if stopped.is_set():
+                return
+            try:
+                with contextlib.closing(self._read_stream(stream)) as batches:
+                    for batch in batches:
+                        if not put(batch):
+                            return
+            except Exception as exc:
+                put(exc)
+            finally:
+                put(_STREAM_DONE)
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            for stream in streams:
+                executor.submit(drain, stream)
+
+            remaining = len(streams)
+            while remaining:
+                item = results.get()
+                if item is _STREAM_DONE:
+                    remaining -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item
+        finally:
+            stopped.set()
+            executor.shutdown(wait=True)
+
+
+def _cancel_read_rows(reader):
+    # ReadRowsStream does not expose a way to close the underlying gRPC call,
+    # which would otherwise keep buffering messages until it is collected.
+    wrapped = getattr(reader, "_wrapped", None)
+    if wrapped is not None and hasattr(wrapped, "cancel"):
+        wrapped.cancel()
+
+
+def rechunk_arrow_batches(batches, chunk_size):
+    """Regroup record batches into batches of at most `chunk_size` rows.
+
+    Only batches are buffered until `chunk_size` rows are available, so at
+    most about two chunks are held in memory at a time.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive, got {}".format(chunk_size))
+
+    pending = []
+    num_pending = 0
+    for batch in batches:
+        pending.append(batch)
+        num_pending += batch.num_rows
+        if num_pending < chunk_size:
+            continue
+
+        table = pa.Table.from_batches(pending).combine_chunks()
+        offset = 0
+        while num_pending - offset >= chunk_size:
+            yield from table.slice(offset, chunk_size).to_batches()
+            offset += chunk_size
+        pending = table.slice(offset).to_batches()
+        num_pending -= offset
+
+    if num_pending:
+        yield from pa.Table.from_batches(pending).combine_chunks().to_batches()
+
+
+# gRPC status code of an append at an offset that was already written.
+_ALREADY_EXISTS = 6
+
+# Errors of a write stream connection after which it is opened again.
+_RECONNECT_ERRORS = (
+    google.api_core.exceptions.Aborted,
+    google.api_core.exceptions.DeadlineExceeded,
+    google.api_core.exceptions.InternalServerError,
+    google.api_core.exceptions.ServiceUnavailable,
+)
+
+# Appending Arrow data to write streams was added in a later release of
+# google-cloud-bigquery-storage than the minimum supported here.
+HAS_ARROW_WRITES = hasattr(bigquery_storage.types.AppendRowsRequest, "ArrowData")
+
+
+class BigQueryStorageWriter:
+    """Append Arrow data to a table with the BigQuery Storage Write API.
+
+    Returned by :meth:`ibis_bigquery.Backend.append_stream`. Each appended
+    record batch is sent as one request at an explicit offset on a single
+    write stream. Up to `max_in_flight` requests are sent without waiting
+    for their acknowledgement; further appends block until one is
+    acknowledged.
+
+    When the server closes the connection, or it fails with a transient
+    error, the writer connects to the same write stream again and resends
+    the requests that were not acknowledged. Their offsets make BigQuery
+    apply each of them once.
+
+    Use the writer as a context manager, or call :meth:`close` when done.
+
+    Parameters
+    ----------
+    write_client : google.cloud.bigquery_storage.BigQueryWriteClient
+    table_path : str
+        The table, as ``projects/{project}/datasets/{dataset}/tables/{table}``.
+    max_in_flight : int
+        Maximum number of unacknowledged append requests.
+    pending : bool
+        Use a pending stream, whose rows all become visible atomically when
+        the writer is closed. Otherwise rows are visible as soon as their
+        append is acknowledged.
+    max_rows_per_request : int
+        Appended data is split into record batches of at most this many
+        rows. Requests must stay under 10 MB.
+    max_reconnects : int
+        Maximum number of times in a row the writer connects again without
+        any request being acknowledged in between.
+
+    Examples
+    --------
+    >>> with con.append_stream("events") as writer:  # doctest: +SKIP
+    ...     for df in frames:
+    ...         writer.append(df)
+
+    """
+
+    def __init__(
+        self,
+        write_client,
+        table_path,
+        max_in_flight=8,
+        pending=False,
+        max_rows_per_request=10_000,
+        max_reconnects=3,
+    ):
+        if max_in_flight < 1:
+            raise ValueError(
+                "max_in_flight must be positive, got {}".format(max_in_flight)
+            )
+        self.write_client = write_client
+        self.table_path = table_path
+        self.max_in_flight = max_in_flight
+        self.pending = pending
+        self.max_rows_per_request = max_rows_per_request
+        self.max_reconnects = max_reconnects
+        #: Offset of the next row to append.
+        self.offset = 0
+        self._stream = None
+        self._schema = None
+        # The requests of the current connection, None when disconnected.
+        self._requests = None
+        self._schema_sent = False
+        # (future, offset, serialized record batch) of each unacknowledged
+        # request, in the order of their offsets.
+        self._in_flight = collections.deque()
+        self._window = threading.Semaphore(max_in_flight)
+        self._lock = threading.Lock()
+        self._error = None
+        self._reader = None
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            # Don't commit a pending stream that was interrupted.
+            self._shutdown()
+
+    @property
+    def stream_name(self):
+        """The name of the write stream, once it has been created."""
+        return None if self._stream is None else self._stream.name
+
+    def append(self, data):
+        """Append a DataFrame, Arrow table or record batch to the table.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            Resolves to the offset of the first appended row once BigQuery
+            has acknowledged the last request of `data`.
+
+        """
+        if self._closed:
+            raise ValueError("The writer is closed")
+        self._raise_error()
+        if isinstance(data, pd.DataFrame):
+            data = pa.Table.from_pandas(data, preserve_index=False)
+        elif isinstance(data, pa.RecordBatch):
+            data = pa.Table.from_batches([data])
+        if self._schema is None:
+            self._schema = data.schema
+        elif not data.schema.equals(self._schema):
+            data = data.cast(self._schema)
+
+        start = self.offset
+        future = None
+        for batch in data.to_batches(max_chunksize=self.max_rows_per_request):
+            if batch.num_rows:
+                future = self._send(batch)
+        if future is None:
+            future = concurrent.futures.Future()
+            future.set_result(start)
+            return future
+
+        result = concurrent.futures.Future()
+        future.add_done_callback(
+            lambda done: result.set_exception(done.exception())
+            if done.exception() is not None
+            else result.set_result(start)
+        )
+        return result
+
+    def flush(self):
+        """Wait until all appends are acknowledged, raising any error."""
+        with self._lock:
+            futures = [future for future, _, _ in self._in_flight]
+        concurrent.futures.wait(futures)
+        self._raise_error()
+
+    def close(self):
+        """Flush, finalize the stream and commit it if it is pending.
+
+        Closing an already closed writer does nothing.
+        """
+        if self._closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self._shutdown()
+        if self._stream is None:
+            return
+        self.write_client.finalize_write_stream(name=self._stream.name)
+        if self.pending:
+            response = self.write_client.batch_commit_write_streams(
+                request={
+                    "parent": self.table_path,
+                    "write_streams": [self._stream.name],
+                }
+            )
+            if response.stream_errors:
+                raise com.IbisError(
+                    "Failed to commit {}: {}".format(
+                        self._stream.name, response.stream_errors[0].error_message
+                    )
+                )
+
+    def _open(self):
+        stream_type = (
+            bigquery_storage.types.WriteStream.Type.PENDING
+            if self.pending
+            else bigquery_storage.types.WriteStream.Type.COMMITTED
+        )
+        self._stream = self.write_client.create_write_stream(
+            parent=self.table_path,
+            write_stream=bigquery_storage.types.WriteStream(type_=stream_type),
+        )
+
+    def _connect(self):
+        # Must be called with the lock held. Unacknowledged requests are
+        # sent again first.
+        self._requests = requests = queue.Queue()
+        self._schema_sent = False
+        for _, offset, payload in self._in_flight:
+            requests.put(self._request(offset, payload))
+        return self.write_client.append_rows(
+            self._request_iterator(requests),
+            metadata=(("x-goog-request-params", "write_stream=" + self._stream.name),),
+        )
+
+    def _request(self, offset, payload):
+        request = bigquery_storage.types.AppendRowsRequest(
+            write_stream=self._stream.name, offset=offset
+        )
+        arrow_data = bigquery_storage.types.AppendRowsRequest.ArrowData(
+            rows=bigquery_storage.types.ArrowRecordBatch(
+                serialized_record_batch=payload
+            )
+        )
+        if not self._schema_sent:
+            # The first request of each connection describes the data.
+            arrow_data.writer_schema = bigquery_storage.types.ArrowSchema(
+                serialized_schema=self._schema.serialize().to_pybytes()
+            )
+            self._schema_sent = True
+        request.arrow_rows = arrow_data
+        return request
+
+    def _send(self, batch):
+        self._window.acquire()
+        with self._lock:
+            if self._error is not None:
+                # Nothing would read the responses to this request.
+                self._window.release()
+                raise self._error
+            if self._stream is None:
+                self._open()
+            if self._requests is None:
+                responses = self._connect()
+                self._reader = threading.Thread(
+                    target=self._read_responses, args=(responses,), daemon=True
+                )
+                self._reader.start()
+            future = concurrent.futures.Future()
+            payload = batch.serialize().to_pybytes()
+            self._in_flight.append((future, self.offset, payload))
+            # Requests are queued under the lock so that they are sent in
+            # the order of their offsets.
+            self._requests.put(self._request(self.offset, payload))
+            self.offset += batch.num_rows
+        return future
+
+    @staticmethod
+    def _request_iterator(requests):
+        while True:
+            request = requests.get()
+            if request is _STREAM_DONE:
+                return
+            yield request
+
+    def _read_responses(self, responses):
+        # Responses arrive in the order of the requests.
+        reconnects = 0
+        while True:
+            error = None
+            try:
+                for response in responses:
+                    reconnects = 0
+                    with self._lock:
+                        future, _, _ = self._in_flight.popleft()
+                    if "error" in response and response.error.code not in (
+                        0,
+                        _ALREADY_EXISTS,
+                    ):
+                        failure = com.IbisError(
+                            "Append failed: {}".format(response.error.message)
+                        )
+                        self._error = self._error or failure
+                        future.set_exception(failure)
+                    else:
+                        future.set_result(None)
+                    self._window.release()
+            except _RECONNECT_ERRORS as exc:
+                error = exc
+            except Exception as exc:
+                self._error = self._error or exc
+
+            with self._lock:
+                # Release the request iterator of the ended connection.
+                self._requests.put(_STREAM_DONE)
+                if self._closed or self._error is not None:
+                    break
+                if not self._in_flight:
+                    # The server ended an idle connection. The next append
+                    # connects again.
+                    self._requests = None
+                    return
+                if reconnects == self.max_reconnects:
+                    self._error = error or com.IbisError("Stream closed by the server")
+                    break
+                reconnects += 1
+                responses = self._connect()
+
+        with self._lock:
+            self._requests = None
+            in_flight, self._in_flight = self._in_flight, collections.deque()
+        for future, _, _ in in_flight:
+            future.set_exception(self._error or com.IbisError("Stream closed"))
+            self._window.release()
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise self._error
+
+    def _shutdown(self):
+        with self._lock:
+            self._closed = True
+            if self._requests is not None:
+                self._requests.put(_STREAM_DONE)
+            reader = self._reader
+        if reader is not None:
+            reader.join()
 
 
 @dt.dtype.register(bq.schema.SchemaField)
@@ -95,6 +819,129 @@ def bigquery_schema(table):
     return sch.schema(fields)
 
 
+def ibis_dtype_to_bigquery_field(name, dtype):
+    """Convert an ibis type to a BigQuery schema field named `name`."""
+    mode = "NULLABLE" if dtype.nullable else "REQUIRED"
+    if isinstance(dtype, dt.Array):
+        field = ibis_dtype_to_bigquery_field(name, dtype.value_type)
+        return bq.SchemaField(
+            name, field.field_type, mode="REPEATED", fields=field.fields
+        )
+    if isinstance(dtype, dt.Struct):
+        return bq.SchemaField(
+            name,
+            "RECORD",
+            mode=mode,
+            fields=[
+                ibis_dtype_to_bigquery_field(field_name, field_type)
+                for field_name, field_type in zip(dtype.names, dtype.types)
+            ],
+        )
+    return bq.SchemaField(name, ibis_type_to_bigquery_type(dtype), mode=mode)
+
+
+def ibis_schema_to_bigquery_schema(schema):
+    """Convert an ibis schema to a list of BigQuery schema fields."""
+    return [
+        ibis_dtype_to_bigquery_field(name, dtype)
+        for name, dtype in zip(schema.names, schema.types)
+    ]
+
+
+# Parquet timestamps are loaded as DATETIME unless they are adjusted to UTC.
+_BIGQUERY_TO_ARROW_TIMESTAMP = {
+    "TIMESTAMP": pa.timestamp("us", tz="UTC"),
+    "DATETIME": pa.timestamp("us"),
+}
+
+
+def cast_to_bigquery_schema(table, fields):
+    """Cast the timestamp columns of `table` to the types of `fields`.
+
+    Columns of ``TIMESTAMP`` fields are adjusted to UTC, naive values being
+    taken as UTC, and columns of ``DATETIME`` fields are made naive.
+    Timestamps are truncated to microseconds, the precision of BigQuery.
+    """
+    for field in fields:
+        target = _BIGQUERY_TO_ARROW_TIMESTAMP.get(field.field_type)
+        index = table.schema.get_field_index(field.name)
+        if target is None or index < 0:
+            continue
+        column = table.column(index)
+        if pa.types.is_timestamp(column.type) and column.type != target:
+            table = table.set_column(index, field.name, column.cast(target, safe=False))
+    return table
+
+
+def load_arrow_table(
+    client,
+    table,
+    destination,
+    write_disposition,
+    chunk_size=1_000_000,
+    max_workers=None,
+    project=None,
+    schema=None,
+):
+    """Load an Arrow `table` into a BigQuery table with Parquet load jobs.
+
+    The table is split into chunks of `chunk_size` rows, each serialized to
+    Parquet in memory and loaded by its own job. The first chunk is loaded
+    with `write_disposition`, and the others are appended concurrently once
+    it is done, by up to `max_workers` threads.
+
+    A failure of a job doesn't undo the chunks that were already appended.
+
+    Parameters
+    ----------
+    schema : List[google.cloud.bigquery.SchemaField], optional
+        The schema of the destination table, to which timestamp columns are
+        cast with :func:`cast_to_bigquery_schema`. Without it, BigQuery
+        loads naive timestamps as ``DATETIME``.
+
+    Returns
+    -------
+    List[google.cloud.bigquery.LoadJob]
+        The finished load jobs.
+
+    """
+    if schema is not None:
+        table = cast_to_bigquery_schema(table, schema)
+    chunks = [
+        table.slice(offset, chunk_size)
+        for offset in range(0, max(table.num_rows, 1), chunk_size)
+    ]
+
+    def load(chunk, write_disposition):
+        buffer = io.BytesIO()
+        pq.write_table(chunk, buffer)
+        buffer.seek(0)
+        job_config = bq.LoadJobConfig()
+        job_config.source_format = bq.SourceFormat.PARQUET
+        job_config.write_disposition = write_disposition
+        # Added in google-cloud-bigquery 2.26.
+        if hasattr(bq, "ParquetOptions"):
+            parquet_options = bq.ParquetOptions()
+            parquet_options.enable_list_inference = True
+            job_config.parquet_options = parquet_options
+        job = client.load_table_from_file(
+            buffer, destination, job_config=job_config, project=project
+        )
+        job.result()
+        return job
+
+    jobs = [load(chunks[0], write_disposition)]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        jobs.extend(
+            executor.map(
+                load,
+                chunks[1:],
+                itertools.repeat(bq.WriteDisposition.WRITE_APPEND),
+            )
+        )
+    return jobs
+
+
 class BigQueryCursor:
     """BigQuery cursor.
 
@@ -103,26 +950,87 @@ class BigQueryCursor:
 
     """
 
-    def __init__(self, query):
-        """Construct a BigQueryCursor with query `query`."""
+    #: Default number of rows returned by :meth:`fetchmany`.
+    arraysize = 1
+
+    def __init__(self, query, record=None, result=None):
+        """Construct a BigQueryCursor with query `query`.
+
+        `result` is the row iterator returned by ``query.result()``, if the
+        job was already waited for.
+        """
         self.query = query
+        self.record = record
+        self._result = result
+        self._rows = None
+        self._batches = None
+
+    @property
+    def result(self):
+        """The :class:`google.cloud.bigquery.table.RowIterator` of results.
+
+        The rows are paged in lazily. The iterator is created once and
+        shared by the fetch methods.
+        """
+        if self._result is None:
+            self._result = self.query.result()
+        return self._result
+
+    def _row_values(self):
+        if self._rows is None:
+            if self._batches is not None:
+                raise ValueError("Results are already fetched as Arrow batches")
+            self._rows = (row.values() for row in self.result)
+        return self._rows
+
+    def __iter__(self):
+        """Iterate over the remaining rows, as tuples."""
+        return self._row_values()
+
+    def fetchone(self):
+        """Fetch the next row, or ``None`` when there are no more rows."""
+        return next(self._row_values(), None)
+
+    def fetchmany(self, size=None):
+        """Fetch the next `size` rows, :attr:`arraysize` by default.
+
+        Fewer rows are returned when there are no more. Only the current
+        page of results is held in memory.
+        """
+        if size is None:
+            size = self.arraysize
+        return list(itertools.islice(self._row_values(), size))
 
     def fetchall(self):
-        """Fetch all rows."""
-        result = self.query.result()
-        return [row.values() for row in result]
+        """Fetch all remaining rows."""
+        return list(self._row_values())
+
+    def fetch_arrow_batch(self):
+        """Fetch the next page of results as a :class:`pyarrow.RecordBatch`.
+
+        Returns ``None`` when there are no more pages. Can't be mixed with
+        fetching rows.
+        """
+        if self._batches is None:
+            if self._rows is not None:
+                raise ValueError("Results are already fetched as rows")
+            result = self.result
+            if hasattr(result, "to_arrow_iterable"):
+                # Added in google-cloud-bigquery 2.31.
+                self._batches = iter(result.to_arrow_iterable())
+            else:
+                self._batches = iter(result.to_arrow().to_batches())
+        return next(self._batches, None)
 
     @property
     def columns(self):
         """Return the columns of the result set."""
-        result = self.query.result()
-        return [field.name for field in result.schema]
+        return [field.name for field in self.result.schema]
 
     @property
     def description(self):
         """Get the fields of the result set's schema."""
-        result = self.query.result()
-        return list(result.schema)
+        return list(self.result.schema)
 
     def __enter__(self):
         # For compatibility when constructed from Query.execute()
@@ -145,6 +1053,409 @@ class BigQueryCursor:
         """
 
 
+class MaximumBytesBilledExceeded(com.IbisError):
+    """A query would bill more bytes than allowed.
+
+    Raised before the query runs when the bytes estimated by a dry run
+    exceed the ``maximum_bytes_billed`` limit.
+
+    Attributes
+    ----------
+    estimated_bytes : int
+        Number of bytes the query would process, according to a dry run.
+    maximum_bytes_billed : int
+        The limit that the estimate exceeded.
+
+    """
+
+    def __init__(self, estimated_bytes, maximum_bytes_billed):
+        super().__init__(
+            "Query would process {:,} bytes, more than the maximum of {:,} "
+            "bytes billed".format(estimated_bytes, maximum_bytes_billed)
+        )
+        self.estimated_bytes = estimated_bytes
+        self.maximum_bytes_billed = maximum_bytes_billed
+
+
+# US multi-region on-demand price, see
+# https://cloud.google.com/bigquery/pricing#on_demand_pricing
+ON_DEMAND_PRICE_PER_TIB = 6.25
+
+_BYTES_PER_TIB = 2**40
+
+
+class QueryEstimate(NamedTuple):
+    """The result of a dry run of a query.
+
+    Attributes
+    ----------
+    total_bytes_processed : int
+        Number of bytes the query would process.
+    referenced_tables : List[str]
+        Fully qualified names of the tables the query reads.
+    schema : ibis.expr.schema.Schema
+        Schema of the query results.
+    estimated_cost : float
+        On-demand cost of the query, in US dollars, before any free tier or
+        minimum billing applies.
+
+    """
+
+    total_bytes_processed: int
+    referenced_tables: List[str]
+    schema: sch.Schema
+    estimated_cost: float
+
+
+def dry_run_schema(job):
+    """Return the result schema of a dry run `job` as an ibis schema."""
+    statistics = job._properties.get("statistics", {}).get("query", {})
+    fields = statistics.get("schema", {}).get("fields", [])
+    return sch.Schema(
+        [field["name"] for field in fields],
+        [
+            bigquery_field_to_ibis_dtype(bq.SchemaField.from_api_repr(field))
+            for field in fields
+        ],
+    )
+
+
+def estimate_from_dry_run(job, price_per_tib=ON_DEMAND_PRICE_PER_TIB):
+    """Summarize a finished dry run `job` as a :class:`QueryEstimate`."""
+    total_bytes_processed = job.total_bytes_processed or 0
+    return QueryEstimate(
+        total_bytes_processed=total_bytes_processed,
+        referenced_tables=[
+            "{}.{}.{}".format(ref.project, ref.dataset_id, ref.table_id)
+            for ref in job.referenced_tables
+        ],
+        schema=dry_run_schema(job),
+        estimated_cost=total_bytes_processed / _BYTES_PER_TIB * price_per_tib,
+    )
+
+
+_POLL_INITIAL_DELAY = 0.1
+_POLL_MAX_DELAY = 2.0
+_POLL_MULTIPLIER = 1.5
+
+
+def poll_delays():
+    """Yield the delays, in seconds, between successive job status checks."""
+    delay = _POLL_INITIAL_DELAY
+    while True:
+        yield delay
+        delay = min(delay * _POLL_MULTIPLIER, _POLL_MAX_DELAY)
+
+
+class RetryPolicy(NamedTuple):
+    """How to retry query jobs that fail with transient errors.
+
+    A failed job is resubmitted as a new job, after an exponentially growing
+    delay, until it succeeds, fails with an error that isn't retryable, has
+    been attempted `max_attempts` times, or would be retried after the
+    `deadline`.
+
+    Attributes
+    ----------
+    max_attempts : int
+        Maximum number of jobs submitted for one query, including the first.
+    initial_delay : float
+        Seconds to wait before the first retry.
+    max_delay : float
+        Maximum number of seconds to wait between attempts.
+    multiplier : float
+        Factor by which the delay grows after each retry.
+    jitter : bool
+        Wait a random time between zero and the delay instead of the full
+        delay, so that clients failing together don't retry together.
+    reasons : FrozenSet[str]
+        BigQuery error reasons that are retried.
+    deadline : float, optional
+        Seconds after the first submission past which no retry is started.
+
+    Examples
+    --------
+    >>> con = ibis.bigquery.connect(  # doctest: +SKIP
+    ...     project_id="my-project",
+    ...     retry_policy=RetryPolicy(max_attempts=5, deadline=600),
+    ... )
+    """
+
+    max_attempts: int = 3
+    initial_delay: float = 1.0
+    max_delay: float = 32.0
+    multiplier: float = 2.0
+    jitter: bool = True
+    reasons: FrozenSet[str] = frozenset(
+        ["rateLimitExceeded", "backendError", "internalError"]
+    )
+    deadline: Optional[float] = 600.0
+
+    def is_retryable(self, exc):
+        """Return whether `exc` is a job failure with a retryable reason."""
+        errors = getattr(exc, "errors", None) or []
+        return any(
+            isinstance(error, dict) and error.get("reason") in self.reasons
+            for error in errors
+        )
+
+    def delays(self):
+        """Yield the delays, in seconds, before successive retries."""
+        delay = self.initial_delay
+        while True:
+            yield random.uniform(0, delay) if self.jitter else delay
+            delay = min(delay * self.multiplier, self.max_delay)
+
+
+# QueryJob.result() restarts failed jobs itself in newer versions of
+# google-cloud-bigquery. That is turned off when a RetryPolicy is used, so
+# that the policy alone decides how many jobs are submitted.
+RESULT_HAS_JOB_RETRY = "job_retry" in inspect.signature(bq.QueryJob.result).parameters
+
+
+# Sessions, QueryJobConfig.create_session and the connection properties that
+# run a query in a session were added in google-cloud-bigquery 2.29.
+HAS_SESSIONS = hasattr(bq, "ConnectionProperty")
+
+
+_SESSION_EXPIRED_RE = re.compile(
+    r"\bsession\b.*\b(expired|terminated|aborted|not found|does not exist)\b",
+    re.IGNORECASE,
+)
+
+
+def is_session_expired(exc):
+    """Return whether `exc` is a job failure caused by an ended session.
+
+    Sessions end after 24 hours without a query, and after 7 days at most.
+    """
+    if not isinstance(exc, google.api_core.exceptions.GoogleAPICallError):
+        return False
+    messages = [exc.message] + [
+        error.get("message", "")
+        for error in exc.errors or []
+        if isinstance(error, dict)
+    ]
+    return any(_SESSION_EXPIRED_RE.search(message or "") for message in messages)
+
+
+# Interruptions that leave a query job running unless it is cancelled.
+_INTERRUPTIONS = (
+    KeyboardInterrupt,
+    concurrent.futures.TimeoutError,
+    asyncio.CancelledError,
+)
+
+
+@contextlib.contextmanager
+def cancel_on_interrupt(job):
+    """Cancel `job` if waiting for it times out or is interrupted.
+
+    Without cancellation, BigQuery keeps running (and billing) the job after
+    the caller stops waiting for it.
+    """
+    try:
+        yield
+    except _INTERRUPTIONS:
+        with contextlib.suppress(Exception):
+            job.cancel()
+        raise
+
+
+class QueryEvent(NamedTuple):
+    """A step in the execution of a query, passed to query listeners.
+
+    Fields that are not known yet at the step are ``None``.
+
+    Attributes
+    ----------
+    kind : str
+        One of ``"compile_start"``, ``"compile_end"``, ``"job_submit"``,
+        ``"job_retry"``, ``"job_done"``, ``"fetch_done"`` and
+        ``"convert_done"``.
+    sql : str
+    job_id : str
+    compile_seconds : float
+        Time spent compiling the expression to SQL.
+    queue_seconds : float
+        Time between the creation of the job and the start of its execution.
+    execution_seconds : float
+        Time BigQuery spent running the job.
+    download_seconds : float
+        Time spent downloading the results.
+    conversion_seconds : float
+        Time spent converting the results to pandas.
+    column_conversion_seconds : dict
+        Part of ``conversion_seconds`` spent adapting the columns whose type
+        isn't converted directly from Arrow, by column name.
+    total_bytes_processed : int
+    total_bytes_billed : int
+    slot_millis : int
+    cache_hit : bool
+    retries : int
+        Number of times the query was resubmitted after a transient failure.
+
+    """
+
+    kind: str
+    sql: Optional[str]
+    job_id: Optional[str]
+    compile_seconds: Optional[float]
+    queue_seconds: Optional[float]
+    execution_seconds: Optional[float]
+    download_seconds: Optional[float]
+    conversion_seconds: Optional[float]
+    column_conversion_seconds: Optional[Dict[str, float]]
+    total_bytes_processed: Optional[int]
+    total_bytes_billed: Optional[int]
+    slot_millis: Optional[int]
+    cache_hit: Optional[bool]
+    retries: Optional[int]
+
+
+def _seconds_between(start, end):
+    if isinstance(start, datetime.datetime) and isinstance(end, datetime.datetime):
+        return (end - start).total_seconds()
+    return None
+
+
+class QueryRecord:
+    """Timings and statistics of one query, filled in as it runs.
+
+    Records of recent queries are kept in
+    :attr:`ibis_bigquery.Backend.query_log`. The attributes are those of
+    :class:`QueryEvent`, without ``kind``.
+
+    """
+
+    __slots__ = QueryEvent._fields[1:]
+
+    def __init__(self, sql=None):
+        for name in self.__slots__:
+            setattr(self, name, None)
+        self.sql = sql
+        self.retries = 0
+
+    def __repr__(self):
+        return "{}({})".format(
+            type(self).__name__,
+            ", ".join(
+                "{}={!r}".format(name, getattr(self, name))
+                for name in self.__slots__
+                if getattr(self, name) is not None
+            ),
+        )
+
+    def update_from_job(self, job):
+        """Copy the timings and statistics of a finished query `job`."""
+        self.job_id = job.job_id
+        self.queue_seconds = _seconds_between(job.created, job.started)
+        self.execution_seconds = _seconds_between(job.started, job.ended)
+        self.total_bytes_processed = job.total_bytes_processed
+        self.total_bytes_billed = job.total_bytes_billed
+        self.slot_millis = job.slot_millis
+        self.cache_hit = job.cache_hit
+
+    def event(self, kind):
+        """Return a :class:`QueryEvent` of the current state of the record."""
+        return QueryEvent(kind, *(getattr(self, name) for name in self.__slots__))
+
+
+class QueryHandle:
+    """A handle on a running BigQuery query job.
+
+    Returned by :meth:`ibis_bigquery.Backend.submit`. Awaiting the handle
+    polls the job from the event loop instead of blocking a thread until the
+    job finishes. Cancelling the awaiting task cancels the job.
+
+    Parameters
+    ----------
+    job : google.cloud.bigquery.QueryJob
+    fetch : Callable[[BigQueryCursor], Any]
+        Downloads and converts the results of the finished job.
+
+    """
+
+    def __init__(self, job, fetch):
+        self.job = job
+        self._fetch = fetch
+
+    def __repr__(self):
+        return "{}(job_id={!r}, state={!r})".format(
+            type(self).__name__, self.job_id, self.job.state
+        )
+
+    @property
+    def job_id(self):
+        """The ID of the query job."""
+        return self.job.job_id
+
+    def done(self):
+        """Return whether the job has finished, refreshing its state."""
+        return self.job.done()
+
+    def cancel(self):
+        """Request that BigQuery cancel the job.
+
+        Returns
+        -------
+        bool
+            Whether the cancellation request was sent.
+
+        """
+        return self.job.cancel()
+
+    def result(self, timeout=None):
+        """Wait for the job to finish and return its results.
+
+        The job is cancelled if waiting times out or is interrupted. Use
+        :meth:`done` to check on the job without cancelling it.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Number of seconds to wait for the job to finish.
+
+        Returns
+        -------
+        output : input type dependent
+            See :meth:`ibis_bigquery.Backend.execute`.
+
+        """
+        with cancel_on_interrupt(self.job):
+            self.job.result(timeout=timeout)
+        return self._fetch(BigQueryCursor(self.job))
+
+    @property
+    def statistics(self):
+        """Statistics of the job as of its last refresh."""
+        job = self.job
+        return {
+            "job_id": job.job_id,
+            "state": job.state,
+            "created": job.created,
+            "started": job.started,
+            "ended": job.ended,
+            "total_bytes_processed": job.total_bytes_processed,
+            "total_bytes_billed": job.total_bytes_billed,
+            "slot_millis": job.slot_millis,
+            "cache_hit": job.cache_hit,
+        }
+
+    def __await__(self):
+        return self._result_async().__await__()
+
+    async def _result_async(self):
+        loop = asyncio.get_event_loop()
+        delays = poll_delays()
+        # Each status check is a short API request, so the executor threads
+        # are only busy while it is in flight rather than for the whole job.
+        with cancel_on_interrupt(self.job):
+            while not await loop.run_in_executor(None, self.job.done):
+                await asyncio.sleep(next(delays))
+        return await loop.run_in_executor(None, self.result)
+
+
 def _find_scalar_parameter(expr):
     """Find all :class:`~ibis.expr.types.ScalarParameter` instances.
 
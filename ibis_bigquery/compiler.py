@@ -2,6 +2,7 @@
 
 from functools import partial
 
+import ibis
 import ibis.expr.lineage as lin
 import regex as re
 import toolz
@@ -95,9 +96,53 @@ class BigQueryCompiler(sql_compiler.Compiler):
         """Generate DDL for temporary resources."""
         queries = map(
             partial(BigQueryUDFDefinition, context=context),
-            lin.traverse(find_bigquery_udf, expr),
+            (
+                udf
+                for udf in lin.traverse(find_bigquery_udf, expr)
+                if not udf.op().persistent
+            ),
         )
 
         # UDFs are uniquely identified by the name of the Node subclass we
         # generate.
         return list(toolz.unique(queries, key=lambda x: type(x.expr.op()).__name__))
+
+
+def persistent_udf_definitions(expr):
+    """Return the DDL creating the persistent UDFs called in `expr`."""
+    return list(
+        toolz.unique(
+            udf.op().js
+            for udf in lin.traverse(find_bigquery_udf, expr)
+            if udf.op().persistent
+        )
+    )
+
+
+def compile_cache_key(expr, limit=None, params=None):
+    """Return a key identifying the query compiled from an expression.
+
+    Expressions that are structurally equal compile to the same SQL, as
+    long as the limit and the set of parameters match. Parameter values
+    are not part of the key because they are sent separately from the SQL.
+
+    Returns
+    -------
+    Optional[Hashable]
+        ``None`` if the expression can't be hashed.
+
+    """
+    if limit == "default":
+        limit = limit, ibis.options.sql.default_limit
+    key = (
+        type(expr),
+        expr._safe_name,
+        expr.op(),
+        limit,
+        frozenset(param.op() for param in (params or {})),
+    )
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
@@ -5,3 +5,6 @@ import ibis.expr.operations as ops
 
 class BigQueryUDFNode(ops.ValueOp):
     """Represents use of a UDF."""
+
+    #: Whether the UDF is a persistent function rather than a temporary one.
+    persistent = False
@@ -0,0 +1,136 @@
+"""Scheduling of batch priority queries."""
+
+import collections
+import contextlib
+import threading
+import time
+from typing import NamedTuple
+
+
+class SchedulerStats(NamedTuple):
+    """Usage statistics of a :class:`FairScheduler`."""
+
+    #: Number of queries waiting for a slot.
+    queued: int
+    #: Number of queries holding a slot.
+    running: int
+    max_concurrency: int
+    #: Number of queries that were given a slot.
+    started: int
+    #: Mean and maximum time spent waiting for a slot, in seconds.
+    mean_wait_seconds: float
+    max_wait_seconds: float
+
+
+class _Ticket:
+    __slots__ = ("granted",)
+
+    def __init__(self):
+        self.granted = False
+
+
+class FairScheduler:
+    """Limit the number of concurrent queries, sharing slots among callers.
+
+    Queries wait for one of `max_concurrency` slots. When a slot frees up,
+    it goes to the caller that was served least recently, so a caller that
+    queues many queries doesn't starve the others. Each caller's queries
+    start in the order they were queued.
+
+    Parameters
+    ----------
+    max_concurrency : int
+        Maximum number of queries holding a slot at the same time.
+
+    """
+
+    def __init__(self, max_concurrency=4):
+        if max_concurrency < 1:
+            raise ValueError(
+                "max_concurrency must be positive, got {}".format(max_concurrency)
+            )
+        self.max_concurrency = max_concurrency
+        self._condition = threading.Condition()
+        # Callers are served in the order of this dict, and moved to its end
+        # when served.
+        self._queues = collections.OrderedDict()
+        self._running = 0
+        self._started = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    @contextlib.contextmanager
+    def slot(self, caller=None):
+        """Wait for a free slot and hold it for the duration of the block.
+
+        Parameters
+        ----------
+        caller : Hashable, optional
+            Identifies who the query runs for. Defaults to the current
+            thread.
+
+        """
+        if caller is None:
+            caller = threading.get_ident()
+        ticket = _Ticket()
+        start = time.monotonic()
+        with self._condition:
+            self._queues.setdefault(caller, collections.deque()).append(ticket)
+            self._grant()
+            try:
+                while not ticket.granted:
+                    self._condition.wait()
+            except BaseException:
+                if ticket.granted:
+                    self._release()
+                else:
+                    self._remove(caller, ticket)
+                raise
+            wait = time.monotonic() - start
+            self._started += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._release()
+
+    def stats(self):
+        """Return the current :class:`SchedulerStats`."""
+        with self._condition:
+            return SchedulerStats(
+                queued=sum(map(len, self._queues.values())),
+                running=self._running,
+                max_concurrency=self.max_concurrency,
+                started=self._started,
+                mean_wait_seconds=(
+                    self._total_wait / self._started if self._started else 0.0
+                ),
+                max_wait_seconds=self._max_wait,
+            )
+
+    def _grant(self):
+        # Must be called with the condition held.
+        granted = False
+        while self._running < self.max_concurrency and self._queues:
+            caller, tickets = next(iter(self._queues.items()))
+            tickets.popleft().granted = True
+            self._running += 1
+            granted = True
+            if tickets:
+                self._queues.move_to_end(caller)
+            else:
+                del self._queues[caller]
+        if granted:
+            self._condition.notify_all()
+
+    def _release(self):
+        self._running -= 1
+        self._grant()
+
+    def _remove(self, caller, ticket):
+        tickets = self._queues[caller]
+        tickets.remove(ticket)
+        if not tickets:
+            del self._queues[caller]
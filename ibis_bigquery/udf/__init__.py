@@ -1,5 +1,6 @@
 import collections
 import functools
+import hashlib
 import inspect
 import itertools
 from typing import Dict, Iterable
@@ -47,7 +48,7 @@ def create_udf_node(name, fields):
     return type(external_name, (BigQueryUDFNode,), fields)
 
 
-def udf(input_type, output_type, strict=True, libraries=None):
+def udf(input_type, output_type, strict=True, libraries=None, persist_to=None):
     '''Define a UDF for BigQuery
 
     Parameters
@@ -61,6 +62,13 @@ def udf(input_type, output_type, strict=True, libraries=None):
         A list of Google Cloud Storage URIs containing to JavaScript source
         code. Note that any symbols (functions, classes, variables, etc.) that
         are exposed in these JavaScript files will be visible inside the UDF.
+    persist_to : str, optional
+        A ``"project.dataset"`` or ``"dataset"`` to create the UDF in as a
+        persistent function, instead of defining a temporary function in
+        every query that calls it. The function is named after a hash of its
+        definition, so changing the UDF creates a new function. It is created
+        the first time a query calling it is executed, if it doesn't exist
+        already, and queries then only reference it by name.
 
     Returns
     -------
@@ -175,6 +183,12 @@ def udf(input_type, output_type, strict=True, libraries=None):
     if libraries is None:
         libraries = []
 
+    if persist_to is not None and not 1 <= len(persist_to.split(".")) <= 2:
+        raise ValueError(
+            "persist_to must be a 'project.dataset' or 'dataset', "
+            "got {!r}".format(persist_to)
+        )
+
     def wrapper(f):
         if not callable(f):
             raise TypeError("f must be callable, got {}".format(f))
@@ -194,15 +208,10 @@ def udf(input_type, output_type, strict=True, libraries=None):
             udf_node_fields["output_shape"] = rlz.shape_like("args")
 
         udf_node_fields["__slots__"] = ("js",)
+        udf_node_fields["persistent"] = persist_to is not None
 
         udf_node = create_udf_node(f.__name__, udf_node_fields)
 
-        @compiles(udf_node)
-        def compiles_udf_node(t, expr):
-            return "{}({})".format(
-                udf_node.__name__, ", ".join(map(t.translate, expr.op().args))
-            )
-
         type_translation_context = UDFContext()
         return_type = ibis_type_to_bigquery_type(
             dt.dtype(output_type), type_translation_context
@@ -217,14 +226,13 @@ def udf(input_type, output_type, strict=True, libraries=None):
             for name, type in zip(parameter_names, input_type)
         )
         source = PythonToJavaScriptTranslator(f).compile()
-        js = '''\
-CREATE TEMPORARY FUNCTION {external_name}({signature})
+        definition = '''\
+({signature})
 RETURNS {return_type}
 LANGUAGE js AS """
 {strict}{source}
 return {internal_name}({args});
 """{libraries};'''.format(
-            external_name=udf_node.__name__,
             internal_name=f.__name__,
             return_type=return_type,
             source=source,
@@ -237,6 +245,19 @@ return {internal_name}({args});
                 else ""
             ),
         )
+        if persist_to is None:
+            function_name = udf_node.__name__
+            js = "CREATE TEMPORARY FUNCTION {}{}".format(function_name, definition)
+        else:
+            digest = hashlib.sha256(definition.encode("utf-8")).hexdigest()[:16]
+            function_name = "`{}.{}_{}`".format(persist_to, f.__name__, digest)
+            js = "CREATE FUNCTION IF NOT EXISTS {}{}".format(function_name, definition)
+
+        @compiles(udf_node)
+        def compiles_udf_node(t, expr):
+            return "{}({})".format(
+                function_name, ", ".join(map(t.translate, expr.op().args))
+            )
 
         @functools.wraps(f)
         def wrapped(*args, **kwargs):
@@ -47,9 +47,9 @@ setuptools.setup(
         "ibis-framework >=2.0.0,<4.0.0dev",
         "db-dtypes>=0.3.0,<2.0.0dev",
         "google-cloud-bigquery >=1.12.0,<4.0.0dev",
-        "google-cloud-bigquery-storage >=1.0.0,<3.0.0dev",
+        "google-cloud-bigquery-storage >=2.0.0,<3.0.0dev",
         "packaging >= 17.0",
-        "pyarrow >=1.0.0,<10.0.0dev",
+        "pyarrow >=2.0.0,<10.0.0dev",
         "pydata-google-auth",
         "sqlalchemy>=1.4,<2.0",
     ],
@@ -0,0 +1,19 @@
+import google.cloud.bigquery as bq
+import pytest
+from google.auth.credentials import AnonymousCredentials
+
+import ibis_bigquery
+
+
+@pytest.fixture
+def backend(mocker):
+    """A connected backend whose API clients are mocks."""
+    backend = ibis_bigquery.Backend().connect(
+        project_id="my-project",
+        dataset_id="my_dataset",
+        credentials=AnonymousCredentials(),
+    )
+    backend.client = mocker.create_autospec(bq.Client, instance=True)
+    backend.client.project = "my-project"
+    backend.storage_client = mocker.Mock()
+    return backend
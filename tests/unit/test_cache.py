@@ -0,0 +1,124 @@
+import os
+
+import pyarrow as pa
+import pytest
+
+from ibis_bigquery.cache import LRUCache, ResultCache, result_cache_key
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache.get("a") == 1
+
+    cache["c"] = 3
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert len(cache) == 2
+
+
+def test_lru_cache_pop_and_clear():
+    cache = LRUCache()
+    cache["a"] = 1
+    cache["b"] = 2
+
+    assert cache.pop("a") == 1
+    assert cache.pop("a", "missing") == "missing"
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_lru_cache_invalid_maxsize():
+    with pytest.raises(ValueError, match="maxsize must be positive"):
+        LRUCache(maxsize=0)
+
+
+def test_lru_cache_ttl(mocker):
+    monotonic = mocker.patch("ibis_bigquery.cache.time.monotonic", return_value=0)
+    cache = LRUCache(ttl=10)
+    cache["a"] = 1
+
+    monotonic.return_value = 9
+    assert cache.get("a") == 1
+
+    monotonic.return_value = 10
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_lru_cache_info():
+    cache = LRUCache(maxsize=4)
+    cache["a"] = 1
+    cache.get("a")
+    cache.get("b")
+
+    assert cache.info() == (1, 1, 4, 1, None)
+
+
+def test_result_cache_roundtrip(tmp_path):
+    cache = ResultCache(str(tmp_path / "results"))
+    table = pa.table({"a": [1, 2, 3], "b": ["x", "y", None]})
+
+    assert cache.get("key") is None
+    cache.put("key", table)
+
+    assert cache.get("key").equals(table)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_result_cache_evicts_least_recently_used(tmp_path):
+    table = pa.table({"a": list(range(1000))})
+    cache = ResultCache(str(tmp_path))
+    cache.put("size", table)
+    size = os.path.getsize(os.path.join(str(tmp_path), "size.arrow"))
+    cache.clear()
+
+    cache = ResultCache(str(tmp_path), max_bytes=2 * size)
+    cache.put("a", table)
+    cache.put("b", table)
+    os.utime(os.path.join(str(tmp_path), "a.arrow"), (0, 0))
+    os.utime(os.path.join(str(tmp_path), "b.arrow"), (1, 1))
+    cache.get("a")
+    cache.put("c", table)
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_result_cache_skips_results_larger_than_cache(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=16)
+
+    cache.put("key", pa.table({"a": list(range(1000))}))
+
+    assert cache.get("key") is None
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_result_cache_drops_unreadable_entries(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    with open(os.path.join(str(tmp_path), "key.arrow"), "wb") as f:
+        f.write(b"not arrow")
+
+    assert cache.get("key") is None
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_result_cache_key():
+    key = result_cache_key("SELECT 1", [], [("p.d.t", "2022-01-01")])
+
+    assert key == result_cache_key("SELECT 1", [], [("p.d.t", "2022-01-01")])
+    assert key != result_cache_key("SELECT 1", [], [("p.d.t", "2022-01-02")])
+    assert key != result_cache_key("SELECT 2", [], [("p.d.t", "2022-01-01")])
+    assert key != result_cache_key(
+        "SELECT 1", [{"name": "x"}], [("p.d.t", "2022-01-01")]
+    )
+    assert key != result_cache_key(
+        "SELECT 1",
+        [],
+        [("p.d.t", "2022-01-01")],
+        ["CREATE TEMPORARY FUNCTION f() AS (1);"],
+    )
@@ -1,6 +1,25 @@
-import ibis  # noqa: F401
+import asyncio
+import collections
+import concurrent.futures
+import datetime
+import threading
+
+import google.api_core.exceptions
+import google.cloud.bigquery as bq
+import ibis
+import ibis.expr.datatypes as dt
+import pandas as pd
+import pandas.testing as tm
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pydata_google_auth
+import pydata_google_auth.cache
 import pytest
+from google.auth.credentials import AnonymousCredentials
+from google.cloud.bigquery_storage import types
+from google.rpc import status_pb2
 
+import ibis_bigquery
 import ibis_bigquery.client
 
 
@@ -31,3 +50,1699 @@ def test_parse_project_and_dataset_raises_error():
         ibis_bigquery.client.parse_project_and_dataset(
             "my-project", "data-project.my_dataset.table"
         )
+
+
+@pytest.mark.parametrize(
+    ["auth_cache", "expected"],
+    [
+        ("default", pydata_google_auth.cache.ReadWriteCredentialsCache),
+        ("reauth", pydata_google_auth.cache.WriteOnlyCredentialsCache),
+        ("none", type(pydata_google_auth.cache.NOOP)),
+    ],
+)
+def test_connect_without_credentials(mocker, auth_cache, expected):
+    default = mocker.patch.object(
+        pydata_google_auth,
+        "default",
+        return_value=(AnonymousCredentials(), "default-project"),
+    )
+
+    backend = ibis_bigquery.connect(dataset_id="my_dataset", auth_cache=auth_cache)
+
+    assert backend.billing_project == "default-project"
+    kwargs = default.call_args.kwargs
+    assert isinstance(kwargs["credentials_cache"], expected)
+
+
+def _query_job(mocker, arrow_table=None, destination=None, sql="SELECT 1"):
+    query = mocker.create_autospec(bq.QueryJob, instance=True)
+    query.to_arrow.return_value = arrow_table
+    query.destination = destination
+    query.query = sql
+    # Unknown, so that results are read with the Storage Read API.
+    query.result.return_value.total_rows = None
+    return query
+
+
+def _storage_client(mocker, streams, schema=None):
+    storage_client = mocker.Mock()
+    session = mocker.Mock()
+    session.streams = [mocker.Mock() for _ in streams]
+    for stream, name in zip(session.streams, streams):
+        stream.name = name
+    if schema is not None:
+        session.arrow_schema.serialized_schema = schema.serialize().to_pybytes()
+    storage_client.create_read_session.return_value = session
+
+    readers = {}
+
+    def read_rows(name):
+        reader = mocker.Mock()
+        pages = []
+        for batch in streams[name]:
+            page = mocker.Mock()
+            page.to_arrow.return_value = batch
+            pages.append(page)
+        reader.rows.return_value.pages = iter(pages)
+        readers[name] = reader
+        return reader
+
+    storage_client.read_rows.side_effect = read_rows
+    return storage_client, readers
+
+
+def _batch(*values):
+    return pa.record_batch([pa.array(values, type=pa.int64())], ["a"])
+
+
+def test_execute_without_destination_uses_storage_client(backend, mocker):
+    query = _query_job(mocker, pa.table({"a": [1, 2, 3]}))
+    backend.client.query.return_value = query
+    t = ibis.table([("a", "int64")], name="t")
+
+    result = backend.execute(t)
+
+    query.to_arrow.assert_called_once_with(bqstorage_client=backend.storage_client)
+    tm.assert_frame_equal(result, pd.DataFrame({"a": [1, 2, 3]}))
+
+
+def test_execute_result_is_writable(backend, mocker):
+    backend.client.query.return_value = _query_job(
+        mocker, pa.table({"a": [1, 2], "f": [1.5, 2.5]})
+    )
+    t = ibis.table([("a", "int64"), ("f", "float64")], name="t")
+
+    result = backend.execute(t)
+    result.loc[0, "a"] = 10
+    result["f"] *= 2
+
+    tm.assert_frame_equal(result, pd.DataFrame({"a": [10, 2], "f": [3.0, 5.0]}))
+
+
+@pytest.mark.parametrize("total_rows", [0, 1, ibis_bigquery.client.REST_READ_MAX_ROWS])
+def test_execute_small_result_uses_rest_api(backend, mocker, total_rows):
+    query = _query_job(
+        mocker, destination=bq.TableReference.from_string("my-project.anon.t")
+    )
+    rows = query.result.return_value
+    rows.total_rows = total_rows
+    rows.to_arrow.return_value = pa.table({"a": [1]})
+    backend.client.query.return_value = query
+    t = ibis.table([("a", "int64")], name="t")
+
+    result = backend.execute(t)
+
+    tm.assert_frame_equal(result, pd.DataFrame({"a": [1]}))
+    rows.to_arrow.assert_called_once_with(create_bqstorage_client=False)
+    backend.storage_client.create_read_session.assert_not_called()
+
+
+def test_execute_falls_back_to_rest_api_without_read_permission(backend, mocker):
+    query = _query_job(
+        mocker, destination=bq.TableReference.from_string("my-project.anon.t")
+    )
+    rows = query.result.return_value
+    rows.to_arrow.return_value = pa.table({"a": [1]})
+    backend.client.query.return_value = query
+    backend.storage_client.create_read_session.side_effect = (
+        google.api_core.exceptions.PermissionDenied("readsessions.create")
+    )
+    t = ibis.table([("a", "int64")], name="t")
+
+    with pytest.warns(UserWarning, match="REST API"):
+        result = backend.execute(t)
+
+    tm.assert_frame_equal(result, pd.DataFrame({"a": [1]}))
+    rows.to_arrow.assert_called_once_with(create_bqstorage_client=False)
+
+
+def test_execute_reads_destination_table(backend, mocker):
+    backend.storage_client, _ = _storage_client(
+        mocker, {"s0": [_batch(1, 2)], "s1": [_batch(3)]}, schema=_batch().schema
+    )
+    backend.client.query.return_value = _query_job(
+        mocker, destination=bq.TableReference.from_string("my-project.anon.t")
+    )
+    t = ibis.table([("a", "int64")], name="t")
+
+    result = backend.execute(t)
+
+    tm.assert_frame_equal(result, pd.DataFrame({"a": [1, 2, 3]}))
+
+
+def test_to_pyarrow(backend, mocker):
+    arrow_table = pa.table({"a": [1, 2, 3]})
+    backend.client.query.return_value = _query_job(mocker, arrow_table)
+    t = ibis.table([("a", "int64")], name="t")
+
+    assert backend.to_pyarrow(t).equals(arrow_table)
+    assert backend.to_pyarrow(t.a).equals(arrow_table.column(0))
+
+
+def test_to_pyarrow_scalar(backend, mocker):
+    backend.client.query.return_value = _query_job(mocker, pa.table({"count": [3]}))
+    t = ibis.table([("a", "int64")], name="t")
+
+    assert backend.to_pyarrow(t.count()).as_py() == 3
+
+
+@pytest.mark.parametrize(
+    ["sizes", "chunk_size", "expected"],
+    [
+        ([3, 3, 3], 4, [4, 4, 1]),
+        ([10], 3, [3, 3, 3, 1]),
+        ([1, 1], 5, [2]),
+        ([2, 2], 2, [2, 2]),
+        ([], 2, []),
+    ],
+)
+def test_rechunk_arrow_batches(sizes, chunk_size, expected):
+    batches = []
+    start = 0
+    for size in sizes:
+        batches.append(pa.record_batch([pa.array(range(start, start + size))], ["a"]))
+        start += size
+
+    result = list(ibis_bigquery.client.rechunk_arrow_batches(batches, chunk_size))
+
+    assert [batch.num_rows for batch in result] == expected
+    values = [value for batch in result for value in batch.column(0).to_pylist()]
+    assert values == list(range(start))
+
+
+def test_storage_reader_read_all_keeps_stream_order(mocker):
+    storage_client, _ = _storage_client(
+        mocker,
+        {"s0": [_batch(1), _batch(2)], "s1": [_batch(3)], "s2": []},
+        schema=_batch().schema,
+    )
+    reader = ibis_bigquery.client.BigQueryStorageReader(
+        storage_client, bq.TableReference.from_string("p.d.t"), "p", parallelism=2
+    )
+
+    result = reader.read_all()
+
+    assert result["a"].to_pylist() == [1, 2, 3]
+    _, kwargs = storage_client.create_read_session.call_args
+    assert kwargs["parent"] == "projects/p"
+    assert kwargs["read_session"].table == "projects/p/datasets/d/tables/t"
+    assert kwargs["max_stream_count"] == 2
+
+
+def test_storage_reader_empty_session(mocker):
+    storage_client, _ = _storage_client(mocker, {}, schema=_batch().schema)
+    reader = ibis_bigquery.client.BigQueryStorageReader(
+        storage_client, bq.TableReference.from_string("p.d.t"), "p"
+    )
+
+    result = reader.read_all()
+
+    assert result.num_rows == 0
+    assert result.schema == _batch().schema
+    _, kwargs = storage_client.create_read_session.call_args
+    assert kwargs["max_stream_count"] == 0
+
+
+def test_storage_reader_read_batches_concurrently(mocker):
+    streams = {"s{}".format(i): [_batch(i, i), _batch(i)] for i in range(4)}
+    storage_client, readers = _storage_client(mocker, streams)
+    reader = ibis_bigquery.client.BigQueryStorageReader(
+        storage_client, bq.TableReference.from_string("p.d.t"), "p", parallelism=3
+    )
+
+    batches = list(reader.read_batches())
+
+    values = [value for batch in batches for value in batch["a"].to_pylist()]
+    assert sorted(values) == sorted([0, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3])
+    assert sorted(readers) == sorted(streams)
+
+
+def test_storage_reader_caps_default_threads(mocker):
+    streams = {"s{}".format(i): [_batch(i)] for i in range(100)}
+    storage_client, _ = _storage_client(mocker, streams, schema=_batch().schema)
+    reader = ibis_bigquery.client.BigQueryStorageReader(
+        storage_client, bq.TableReference.from_string("p.d.t"), "p"
+    )
+    executor = mocker.spy(ibis_bigquery.client, "ThreadPoolExecutor")
+
+    result = reader.read_all()
+
+    assert result["a"].to_pylist() == list(range(100))
+    executor.assert_called_once_with(
+        max_workers=ibis_bigquery.client.DEFAULT_READ_THREADS
+    )
+    assert ibis_bigquery.client.DEFAULT_READ_THREADS <= 32
+
+
+def test_storage_reader_read_batches_raises_stream_error(mocker):
+    storage_client, _ = _storage_client(mocker, {"s0": [_batch(1)], "s1": []})
+    storage_client.read_rows.side_effect = ValueError("boom")
+    reader = ibis_bigquery.client.BigQueryStorageReader(
+        storage_client, bq.TableReference.from_string("p.d.t"), "p"
+    )
+
+    with pytest.raises(ValueError, match="boom"):
+        list(reader.read_batches())
+
+
+def test_storage_reader_stops_early(mocker):
+    storage_client, readers = _storage_client(
+        mocker, {"s0": [_batch(1), _batch(2)], "s1": [_batch(3)]}
+    )
+    session = storage_client.create_read_session.return_value
+    session.streams = session.streams[:1]
+    reader = ibis_bigquery.client.BigQueryStorageReader(
+        storage_client, bq.TableReference.from_string("p.d.t"), "p"
+    )
+
+    batches = reader.read_batches()
+    assert next(batches)["a"].to_pylist() == [1]
+    batches.close()
+
+    assert list(readers) == ["s0"]
+    readers["s0"]._wrapped.cancel.assert_called_once_with()
+
+
+def test_storage_reader_preserve_order_uses_one_stream(backend, mocker):
+    backend.read_parallelism = 8
+    cursor = ibis_bigquery.BigQueryCursor(
+        _query_job(
+            mocker,
+            destination=bq.TableReference.from_string("my-project.anon.t"),
+            sql="SELECT a FROM t ORDER BY a",
+        )
+    )
+
+    backend.storage_client, _ = _storage_client(mocker, {})
+
+    reader = backend._storage_reader(cursor)
+
+    assert reader.session is backend.storage_client.create_read_session.return_value
+
+    _, kwargs = reader.storage_client.create_read_session.call_args
+    assert kwargs["max_stream_count"] == 1
+
+
+@pytest.mark.parametrize(
+    ["sql", "expected"],
+    [
+        ("SELECT a FROM t ORDER BY a", True),
+        ("SELECT a FROM t\nORDER\n  BY a", True),
+        ("select a from t order by a", True),
+        ("SELECT a FROM t", False),
+        ("SELECT border_by FROM t", False),
+    ],
+)
+def test_contains_order_by(sql, expected):
+    assert ibis_bigquery.client.contains_order_by(sql) is expected
+
+
+def test_to_pyarrow_batches(backend, mocker):
+    batch = _batch(1, 2, 3)
+    backend.storage_client, _ = _storage_client(mocker, {"s0": [batch, batch]})
+    backend.client.query.return_value = _query_job(
+        mocker, destination=bq.TableReference.from_string("my-project.anon.t")
+    )
+    t = ibis.table([("a", "int64")], name="t")
+
+    batches = backend.to_pyarrow_batches(t, chunk_size=2)
+
+    backend.client.query.assert_called_once()
+    assert [b.num_rows for b in batches] == [2, 2, 2]
+
+
+def test_to_pyarrow_batches_reads_all_rows_by_default(backend, mocker):
+    backend.client.query.return_value = _query_job(mocker, pa.table({"a": [1]}))
+    t = ibis.table([("a", "int64")], name="t")
+
+    backend.to_pyarrow_batches(t)
+
+    sql = backend.client.query.call_args.args[0]
+    assert "LIMIT" not in sql
+
+
+def test_to_pyarrow_batches_validates_chunk_size(backend):
+    t = ibis.table([("a", "int64")], name="t")
+
+    with pytest.raises(ValueError, match="chunk_size"):
+        backend.to_pyarrow_batches(t, chunk_size=0)
+
+    backend.client.query.assert_not_called()
+
+
+def test_submit_does_not_wait_for_job(backend, mocker):
+    query = _query_job(mocker, pa.table({"a": [1, 2]}))
+    query.job_id = "job-1"
+    backend.client.query.return_value = query
+    t = ibis.table([("a", "int64")], name="t")
+
+    handle = backend.submit(t)
+
+    query.result.assert_not_called()
+    assert handle.job_id == "job-1"
+    query.done.return_value = False
+    assert not handle.done()
+    handle.cancel()
+    query.cancel.assert_called_once_with()
+
+
+def test_submit_result(backend, mocker):
+    query = _query_job(mocker, pa.table({"count": [2]}))
+    backend.client.query.return_value = query
+    t = ibis.table([("a", "int64")], name="t")
+
+    handle = backend.submit(t.count())
+
+    assert handle.result(timeout=10) == 2
+    query.result.assert_called_once_with(timeout=10)
+
+
+def test_submit_statistics(backend, mocker):
+    query = _query_job(mocker)
+    query.total_bytes_processed = 1024
+    query.cache_hit = False
+    backend.client.query.return_value = query
+    t = ibis.table([("a", "int64")], name="t")
+
+    statistics = backend.submit(t).statistics
+
+    assert statistics["total_bytes_processed"] == 1024
+    assert statistics["cache_hit"] is False
+
+
+def test_execute_async_polls_job(backend, mocker):
+    mocker.patch("ibis_bigquery.client._POLL_INITIAL_DELAY", 0)
+    query = _query_job(mocker, pa.table({"a": [1, 2]}))
+    query.done.side_effect = [False, False, True]
+    backend.client.query.return_value = query
+    t = ibis.table([("a", "int64")], name="t")
+
+    result = asyncio.run(backend.execute_async(t))
+
+    assert query.done.call_count == 3
+    tm.assert_frame_equal(result, pd.DataFrame({"a": [1, 2]}))
+
+
+def test_execute_async_submits_off_the_event_loop(backend, mocker):
+    query = _query_job(mocker, pa.table({"a": [1]}))
+    query.done.return_value = True
+    threads = []
+    backend.client.query.side_effect = lambda *args, **kwargs: (
+        threads.append(threading.current_thread()) or query
+    )
+    t = ibis.table([("a", "int64")], name="t")
+
+    asyncio.run(backend.execute_async(t))
+
+    assert threads and threads[0] is not threading.main_thread()
+
+
+def test_execute_many_returns_results_in_order(backend, mocker):
+    mocker.patch("ibis_bigquery.time.sleep")
+    first = _query_job(mocker, pa.table({"count": [1]}))
+    second = _query_job(mocker, pa.table({"max": [2]}))
+    first.done.side_effect = [False, True]
+    second.done.side_effect = [True]
+    backend.client.query.side_effect = [first, second]
+    t = ibis.table([("a", "int64")], name="t")
+
+    result = backend.execute_many([t.count(), t.a.max()])
+
+    assert result == [1, 2]
+
+
+def test_execute_many_max_concurrency(backend, mocker):
+    jobs = [_query_job(mocker, pa.table({"count": [i]})) for i in range(3)]
+    submitted = []
+
+    def query(*args, **kwargs):
+        job = jobs[len(submitted)]
+        submitted.append(job)
+        # Every job finishes the first time it is polled.
+        assert sum(not j.done.called for j in submitted) <= 2
+        return job
+
+    backend.client.query.side_effect = query
+    t = ibis.table([("a", "int64")], name="t")
+
+    result = backend.execute_many([t.count()] * 3, max_concurrency=2)
+
+    assert result == [0, 1, 2]
+
+
+def test_execute_many_fail_fast_cancels_running_jobs(backend, mocker):
+    failed = _query_job(mocker)
+    failed.result.side_effect = ValueError("boom")
+    running = _query_job(mocker)
+    running.done.return_value = False
+    backend.client.query.side_effect = [failed, running]
+    t = ibis.table([("a", "int64")], name="t")
+
+    with pytest.raises(ValueError, match="boom"):
+        backend.execute_many([t.count(), t.count()])
+
+    running.cancel.assert_called_once_with()
+
+
+def test_execute_many_collects_errors(backend, mocker):
+    failed = _query_job(mocker)
+    error = ValueError("boom")
+    failed.result.side_effect = error
+    ok = _query_job(mocker, pa.table({"count": [2]}))
+    backend.client.query.side_effect = [failed, ok]
+    t = ibis.table([("a", "int64")], name="t")
+
+    result = backend.execute_many([t.count(), t.count()], fail_fast=False)
+
+    assert result == [error, 2]
+
+
+def _dry_run_job(client, fields, total_bytes_processed=0, referenced_tables=()):
+    job = bq.QueryJob("job-1", "SELECT 1", client)
+    job._properties["statistics"] = {
+        "totalBytesProcessed": str(total_bytes_processed),
+        "query": {
+            "totalBytesProcessed": str(total_bytes_processed),
+            "referencedTables": [
+                dict(zip(["projectId", "datasetId", "tableId"], ref.split(".")))
+                for ref in referenced_tables
+            ],
+            "schema": {"fields": fields},
+        },
+    }
+    return job
+
+
+def test_sql_uses_cached_dry_run_schema(backend):
+    backend.client.query.return_value = _dry_run_job(
+        backend.client, [{"name": "a", "type": "INTEGER", "mode": "NULLABLE"}]
+    )
+
+    first = backend.sql("SELECT a FROM t")
+    second = backend.sql("SELECT a FROM t")
+
+    assert first.schema() == second.schema() == ibis.schema([("a", "int64")])
+    backend.client.query.assert_called_once()
+    _, kwargs = backend.client.query.call_args
+    assert kwargs["job_config"].dry_run
+
+
+def test_estimate_submits_dry_run(backend):
+    backend.client.query.return_value = _dry_run_job(
+        backend.client,
+        [
+            {"name": "a", "type": "INTEGER", "mode": "NULLABLE"},
+            {"name": "b", "type": "STRING", "mode": "REPEATED"},
+        ],
+        total_bytes_processed=2**40,
+        referenced_tables=["p.d.t"],
+    )
+    t = ibis.table([("a", "int64")], name="t")
+
+    estimate = backend.estimate(t, price_per_tib=5.0)
+
+    _, kwargs = backend.client.query.call_args
+    assert kwargs["job_config"].dry_run
+    assert not kwargs["job_config"].use_query_cache
+    assert estimate.total_bytes_processed == 2**40
+    assert estimate.referenced_tables == ["p.d.t"]
+    assert estimate.schema == ibis.schema([("a", "int64"), ("b", "array<string>")])
+    assert estimate.estimated_cost == 5.0
+
+
+def _bq_table(table_id, fields=(("a", "INTEGER"),)):
+    return bq.Table(table_id, schema=[bq.SchemaField(*field) for field in fields])
+
+
+def test_table_metadata_is_fetched_once(backend):
+    backend.client.get_table.return_value = _bq_table("my-project.my_dataset.t")
+
+    first = backend.table("t")
+    second = backend.table("my_dataset.t")
+
+    assert first.schema() == second.schema() == ibis.schema([("a", "int64")])
+    backend.client.get_table.assert_called_once_with("my-project.my_dataset.t")
+
+
+def test_invalidate_table_metadata(backend):
+    backend.client.get_table.side_effect = [
+        _bq_table("my-project.my_dataset.t"),
+        _bq_table("my-project.my_dataset.t", [("a", "INTEGER"), ("b", "STRING")]),
+    ]
+    backend.table("t")
+
+    backend.invalidate("t")
+
+    assert backend.table("t").schema() == ibis.schema([("a", "int64"), ("b", "string")])
+    assert backend.client.get_table.call_count == 2
+
+
+def test_clear_cache(backend):
+    backend.client.get_table.return_value = _bq_table("my-project.my_dataset.t")
+    backend.table("t")
+    backend.table("other_dataset.t")
+
+    backend.clear_cache()
+    backend.table("t")
+
+    assert backend.client.get_table.call_count == 3
+
+
+def test_execute_uses_result_cache(backend, mocker, tmp_path):
+    backend.result_cache = ibis_bigquery.cache.ResultCache(str(tmp_path))
+    dry_run = _dry_run_job(backend.client, [], referenced_tables=["p.d.t"])
+    query = _query_job(mocker, pa.table({"a": [1, 2, 3]}))
+    bq_table = _bq_table("p.d.t")
+    bq_table._properties["lastModifiedTime"] = "1000"
+    backend.client.get_table.return_value = bq_table
+    backend.client.query.side_effect = [dry_run, query, dry_run]
+    t = ibis.table([("a", "int64")], name="t")
+
+    first = backend.execute(t)
+    second = backend.execute(t)
+
+    tm.assert_frame_equal(first, second)
+    assert backend.client.query.call_count == 3
+    assert backend.result_cache.hits == 1
+    second.loc[0, "a"] = 10
+
+
+def test_execute_result_cache_checks_table_freshness(backend, mocker, tmp_path):
+    backend.result_cache = ibis_bigquery.cache.ResultCache(str(tmp_path))
+    dry_run = _dry_run_job(backend.client, [], referenced_tables=["p.d.t"])
+    old, new = _bq_table("p.d.t"), _bq_table("p.d.t")
+    old._properties["lastModifiedTime"] = "1000"
+    new._properties["lastModifiedTime"] = "2000"
+    backend.client.get_table.side_effect = [old, new]
+    backend.client.query.side_effect = [
+        dry_run,
+        _query_job(mocker, pa.table({"a": [1]})),
+        dry_run,
+        _query_job(mocker, pa.table({"a": [2]})),
+    ]
+    t = ibis.table([("a", "int64")], name="t")
+
+    backend.execute(t)
+    result = backend.execute(t)
+
+    tm.assert_frame_equal(result, pd.DataFrame({"a": [2]}))
+
+
+def test_execute_destination(backend, mocker):
+    destination = bq.TableReference.from_string("my-project.my_dataset.results")
+    backend.storage_client, _ = _storage_client(
+        mocker, {"s0": [_batch(1, 2)]}, schema=_batch().schema
+    )
+    backend.client.query.return_value = _query_job(mocker, destination=destination)
+    t = ibis.table([("a", "int64")], name="t")
+
+    result = backend.execute(t, destination="results")
+
+    (sql,), kwargs = backend.client.query.call_args
+    assert "LIMIT" not in sql
+    job_config = kwargs["job_config"]
+    assert job_config.destination == destination
+    assert job_config.write_disposition == bq.WriteDisposition.WRITE_TRUNCATE
+    _, kwargs = backend.storage_client.create_read_session.call_args
+    assert kwargs["read_session"].table == (
+        "projects/my-project/datasets/my_dataset/tables/results"
+    )
+    tm.assert_frame_equal(result, pd.DataFrame({"a": [1, 2]}))
+
+
+def test_execute_large_results_uses_scratch_table(backend, mocker):
+    backend.scratch_dataset = "scratch-project.scratch"
+    backend.client.create_table.side_effect = lambda table: table
+    backend.client.query.return_value = _query_job(mocker, pa.table({"a": [1]}))
+    t = ibis.table([("a", "int64")], name="t")
+
+    backend.execute(t, large_results=True)
+
+    (scratch,), _ = backend.client.create_table.call_args
+    assert scratch.project == "scratch-project"
+    assert scratch.dataset_id == "scratch"
+    assert scratch.table_id.startswith("ibis_result_")
+    assert scratch.expires is not None
+    (sql,), kwargs = backend.client.query.call_args
+    assert "LIMIT" not in sql
+    assert kwargs["job_config"].destination.table_id == scratch.table_id
+    backend.client.delete_table.assert_called_once_with(scratch, not_found_ok=True)
+
+
+def test_execute_destination_with_limit(backend, mocker):
+    backend.client.query.return_value = _query_job(mocker, pa.table({"a": [1]}))
+    t = ibis.table([("a", "int64")], name="t")
+
+    backend.execute(t, destination="results", limit=5)
+
+    (sql,), _ = backend.client.query.call_args
+    assert sql.endswith("LIMIT 5")
+
+
+def test_execute_large_results_requires_scratch_dataset(backend):
+    t = ibis.table([("a", "int64")], name="t")
+
+    with pytest.raises(ValueError, match="scratch dataset"):
+        backend.execute(t, large_results=True)
+
+
+def test_maximum_bytes_billed(backend, mocker):
+    backend.maximum_bytes_billed = 1000
+    backend.client.query.side_effect = [
+        _query_job(mocker, pa.table({"a": [1]})),
+        _query_job(mocker, pa.table({"a": [1]})),
+    ]
+    t = ibis.table([("a", "int64")], name="t")
+
+    backend.execute(t)
+    _, kwargs = backend.client.query.call_args
+    assert kwargs["job_config"].maximum_bytes_billed == 1000
+
+    backend.execute(t, maximum_bytes_billed=10)
+    _, kwargs = backend.client.query.call_args
+    assert kwargs["job_config"].maximum_bytes_billed == 10
+
+
+def test_check_bytes_billed_raises_before_running_query(backend):
+    backend.maximum_bytes_billed = 1000
+    backend.check_bytes_billed = True
+    backend.client.query.return_value = _dry_run_job(
+        backend.client, [], total_bytes_processed=5000
+    )
+    t = ibis.table([("a", "int64")], name="t")
+
+    with pytest.raises(ibis_bigquery.MaximumBytesBilledExceeded) as excinfo:
+        backend.execute(t)
+
+    assert excinfo.value.estimated_bytes == 5000
+    assert excinfo.value.maximum_bytes_billed == 1000
+    _, kwargs = backend.client.query.call_args
+    assert kwargs["job_config"].dry_run
+
+
+def test_query_listener_events(backend, mocker):
+    created = datetime.datetime(2021, 1, 1, tzinfo=datetime.timezone.utc)
+    job = _query_job(mocker, pa.table({"a": [1]}))
+    job.job_id = "job-1"
+    job.created = created
+    job.started = created + datetime.timedelta(seconds=2)
+    job.ended = created + datetime.timedelta(seconds=5)
+    job.total_bytes_processed = 100
+    job.total_bytes_billed = 10 * 2**20
+    job.slot_millis = 30
+    job.cache_hit = False
+    backend.client.query.return_value = job
+    events = []
+    backend.add_query_listener(events.append)
+    t = ibis.table([("a", "int64")], name="t")
+
+    backend.execute(t)
+
+    assert [event.kind for event in events] == [
+        "compile_start",
+        "compile_end",
+        "job_submit",
+        "job_done",
+        "fetch_done",
+        "convert_done",
+    ]
+    done = events[-2]
+    assert done.sql == backend.compile(t, limit="default")
+    assert done.job_id == "job-1"
+    assert done.compile_seconds >= 0
+    assert done.queue_seconds == 2
+    assert done.execution_seconds == 3
+    assert done.download_seconds >= 0
+    assert done.total_bytes_billed == 10 * 2**20
+    assert done.cache_hit is False
+    assert done.conversion_seconds is None
+    converted = events[-1]
+    assert converted.conversion_seconds >= 0
+    assert converted.column_conversion_seconds == {}
+    (record,) = backend.query_log
+    assert record.event("convert_done") == converted
+
+
+def test_remove_query_listener(backend, mocker):
+    backend.client.query.return_value = _query_job(mocker, pa.table({"a": [1]}))
+    listener = backend.add_query_listener(mocker.Mock())
+    backend.remove_query_listener(listener)
+
+    backend.raw_sql("SELECT 1")
+
+    listener.assert_not_called()
+    assert len(backend.query_log) == 1
+
+
+def test_query_log_is_bounded(backend, mocker):
+    backend.query_log = collections.deque(maxlen=2)
+    backend.client.query.return_value = _query_job(mocker)
+
+    for i in range(3):
+        backend.raw_sql("SELECT {}".format(i))
+
+    assert [record.sql for record in backend.query_log] == ["SELECT 1", "SELECT 2"]
+
+
+@pytest.mark.parametrize(
+    "exception", [concurrent.futures.TimeoutError, KeyboardInterrupt]
+)
+def test_execute_cancels_interrupted_job(backend, mocker, exception):
+    query = _query_job(mocker)
+    query.result.side_effect = exception
+    backend.client.query.return_value = query
+    t = ibis.table([("a", "int64")], name="t")
+
+    with pytest.raises(exception):
+        backend.execute(t, timeout=5)
+
+    query.result.assert_called_once_with(timeout=5)
+    query.cancel.assert_called_once_with()
+    _, kwargs = backend.client.query.call_args
+    assert kwargs["job_config"].job_timeout_ms == "5000"
+
+
+def test_execute_does_not_cancel_failed_job(backend, mocker):
+    query = _query_job(mocker)
+    query.result.side_effect = ValueError("query failed")
+    backend.client.query.return_value = query
+    t = ibis.table([("a", "int64")], name="t")
+
+    with pytest.raises(ValueError):
+        backend.execute(t)
+
+    query.cancel.assert_not_called()
+
+
+def test_connect_job_timeout(backend, mocker):
+    backend.job_timeout = 60
+    query = _query_job(mocker)
+    backend.client.query.return_value = query
+
+    backend.raw_sql("SELECT 1")
+
+    query.result.assert_called_once_with(timeout=60)
+    _, kwargs = backend.client.query.call_args
+    assert kwargs["job_config"].job_timeout_ms == "60000"
+
+
+def test_execute_async_timeout_cancels_job(backend, mocker):
+    mocker.patch("ibis_bigquery.client._POLL_INITIAL_DELAY", 0)
+    query = _query_job(mocker)
+    query.done.return_value = False
+    backend.client.query.return_value = query
+    t = ibis.table([("a", "int64")], name="t")
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(backend.execute_async(t, timeout=0.05))
+
+    query.cancel.assert_called_once_with()
+
+
+def _failed_query_job(mocker, reason):
+    query = _query_job(mocker)
+    query.result.side_effect = google.api_core.exceptions.InternalServerError(
+        "job failed", errors=[{"reason": reason, "message": "job failed"}]
+    )
+    return query
+
+
+def test_retry_policy_resubmits_failed_job(backend, mocker):
+    sleep = mocker.patch("ibis_bigquery.time.sleep")
+    backend.retry_policy = ibis_bigquery.RetryPolicy(jitter=False)
+    failed = _failed_query_job(mocker, "backendError")
+    failed.job_id = "job-1"
+    succeeded = _query_job(mocker)
+    succeeded.job_id = "job-2"
+    backend.client.query.side_effect = [failed, succeeded]
+    events = []
+    backend.add_query_listener(events.append)
+
+    cursor = backend.raw_sql("SELECT 1")
+
+    assert cursor.query is succeeded
+    sleep.assert_called_once_with(1.0)
+    assert [event.kind for event in events] == [
+        "job_submit",
+        "job_retry",
+        "job_submit",
+        "job_done",
+    ]
+    (record,) = backend.query_log
+    assert record.retries == 1
+    assert record.job_id == "job-2"
+    if ibis_bigquery.client.RESULT_HAS_JOB_RETRY:
+        succeeded.result.assert_called_once_with(timeout=None, job_retry=None)
+
+
+def test_retry_policy_gives_up(backend, mocker):
+    mocker.patch("ibis_bigquery.time.sleep")
+    backend.retry_policy = ibis_bigquery.RetryPolicy(max_attempts=2)
+    backend.client.query.side_effect = [
+        _failed_query_job(mocker, "rateLimitExceeded") for _ in range(3)
+    ]
+
+    with pytest.raises(google.api_core.exceptions.InternalServerError):
+        backend.raw_sql("SELECT 1")
+
+    assert backend.client.query.call_count == 2
+
+
+def test_retry_policy_ignores_other_errors(backend, mocker):
+    backend.retry_policy = ibis_bigquery.RetryPolicy()
+    backend.client.query.return_value = _failed_query_job(mocker, "invalidQuery")
+
+    with pytest.raises(google.api_core.exceptions.InternalServerError):
+        backend.raw_sql("SELECT 1")
+
+    backend.client.query.assert_called_once()
+
+
+def test_retry_policy_delays():
+    policy = ibis_bigquery.RetryPolicy(
+        initial_delay=1, max_delay=5, multiplier=2, jitter=False
+    )
+    delays = policy.delays()
+    assert [next(delays) for _ in range(5)] == [1, 2, 4, 5, 5]
+
+    delays = policy._replace(jitter=True).delays()
+    assert all(0 <= next(delays) <= 5 for _ in range(10))
+
+
+def test_execute_batch_priority(backend, mocker):
+    backend.client.query.return_value = _query_job(mocker, pa.table({"a": [1]}))
+    t = ibis.table([("a", "int64")], name="t")
+
+    backend.execute(t, priority="batch")
+
+    _, kwargs = backend.client.query.call_args
+    assert kwargs["job_config"].priority == bq.QueryPriority.BATCH
+    assert backend.batch_scheduler.stats().started == 1
+
+
+def test_execute_invalid_priority(backend):
+    t = ibis.table([("a", "int64")], name="t")
+
+    with pytest.raises(ValueError, match="priority"):
+        backend.execute(t, priority="urgent")
+
+
+def test_session_defines_udfs_once(backend, mocker):
+    @ibis_bigquery.udf(input_type=[dt.double], output_type=dt.double)
+    def add_one(x):
+        return x + 1
+
+    backend.session = True
+    setup = _query_job(mocker)
+    setup.session_info = mocker.Mock(session_id="session-1")
+    backend.client.query.side_effect = [
+        setup,
+        _query_job(mocker, pa.table({"a": [1.0], "b": [2.0]})),
+        _query_job(mocker, pa.table({"a": [1.0], "b": [2.0]})),
+    ]
+    t = ibis.table([("a", "double")], name="t")
+    expr = t.mutate(b=add_one(t.a))
+
+    backend.execute(expr)
+    backend.execute(expr)
+
+    (setup_sql,), kwargs = backend.client.query.call_args_list[0]
+    assert setup_sql == add_one.js
+    assert kwargs["job_config"].create_session
+    for (sql,), kwargs in backend.client.query.call_args_list[1:]:
+        assert sql.startswith("SELECT")
+        (connection_property,) = kwargs["job_config"].connection_properties
+        assert connection_property.key == "session_id"
+        assert connection_property.value == "session-1"
+
+
+def test_session_requires_session_support(mocker):
+    mocker.patch.object(ibis_bigquery, "HAS_SESSIONS", False)
+
+    with pytest.raises(
+        ibis.common.exceptions.UnsupportedOperationError, match="session"
+    ):
+        ibis_bigquery.connect(
+            project_id="my-project",
+            credentials=AnonymousCredentials(),
+            session=True,
+        )
+
+
+def test_session_result_cache_key_includes_definitions(backend, mocker, tmp_path):
+    @ibis_bigquery.udf(input_type=[dt.double], output_type=dt.double)
+    def add_one(x):
+        return x + 1
+
+    backend.session = True
+    backend.result_cache = ibis_bigquery.cache.ResultCache(str(tmp_path))
+    setup = _query_job(mocker)
+    setup.session_info = mocker.Mock(session_id="session-1")
+    backend.client.query.side_effect = [
+        setup,
+        _dry_run_job(backend.client, []),
+        _query_job(mocker, pa.table({"a": [1.0], "b": [2.0]})),
+    ]
+    result_cache_key = mocker.spy(ibis_bigquery, "result_cache_key")
+    t = ibis.table([("a", "double")], name="t")
+
+    backend.execute(t.mutate(b=add_one(t.a)))
+
+    (sql, _, _, definitions), _ = result_cache_key.call_args
+    assert add_one.js not in sql
+    assert definitions == [add_one.js]
+
+
+def test_close_session(backend, mocker):
+    backend.session = True
+    backend._session_id = "session-1"
+    backend._session_definitions["CREATE TEMPORARY FUNCTION f() AS (1);"] = None
+    backend.client.query.return_value = _query_job(mocker)
+
+    backend.close_session()
+
+    (sql,), _ = backend.client.query.call_args
+    assert sql == "CALL BQ.ABORT_SESSION()"
+    assert backend._session_id is None
+    assert not backend._session_definitions
+
+
+def _session_expired():
+    return google.api_core.exceptions.BadRequest(
+        "Session session-1 has expired and is no longer available."
+    )
+
+
+def test_close_expired_session(backend, mocker):
+    backend.session = True
+    backend._session_id = "session-1"
+    job = _query_job(mocker)
+    job.result.side_effect = _session_expired()
+    backend.client.query.return_value = job
+
+    backend.close_session()
+
+    assert backend._session_id is None
+
+
+def test_expired_session_is_renewed(backend, mocker):
+    @ibis_bigquery.udf(input_type=[dt.double], output_type=dt.double)
+    def add_one(x):
+        return x + 1
+
+    backend.session = True
+    setups = [_query_job(mocker), _query_job(mocker)]
+    setups[0].session_info = mocker.Mock(session_id="session-1")
+    setups[1].session_info = mocker.Mock(session_id="session-2")
+    expired = _query_job(mocker)
+    expired.result.side_effect = _session_expired()
+    backend.client.query.side_effect = [
+        setups[0],
+        expired,
+        setups[1],
+        _query_job(mocker, pa.table({"a": [1.0], "b": [2.0]})),
+    ]
+    t = ibis.table([("a", "double")], name="t")
+
+    result = backend.execute(t.mutate(b=add_one(t.a)))
+
+    assert result["b"].tolist() == [2.0]
+    calls = backend.client.query.call_args_list
+    (sql,), kwargs = calls[2]
+    assert sql == add_one.js
+    assert kwargs["job_config"].create_session
+    (sql,), kwargs = calls[3]
+    assert sql.startswith("SELECT")
+    (connection_property,) = kwargs["job_config"].connection_properties
+    assert connection_property.value == "session-2"
+    assert backend._session_id == "session-2"
+
+
+def test_is_session_expired():
+    assert ibis_bigquery.client.is_session_expired(_session_expired())
+    assert not ibis_bigquery.client.is_session_expired(
+        google.api_core.exceptions.BadRequest("Syntax error")
+    )
+
+
+def test_persistent_udf_is_created_once(backend, mocker):
+    @ibis_bigquery.udf(
+        input_type=[dt.double], output_type=dt.double, persist_to="my-project.udfs"
+    )
+    def add_one(x):
+        return x + 1
+
+    backend.client.query.side_effect = [
+        _query_job(mocker),
+        _query_job(mocker, pa.table({"a": [1.0], "b": [2.0]})),
+        _query_job(mocker, pa.table({"a": [1.0], "b": [2.0]})),
+    ]
+    t = ibis.table([("a", "double")], name="t")
+    expr = t.mutate(b=add_one(t.a))
+
+    backend.execute(expr)
+    backend.execute(expr)
+
+    sqls = [args[0] for args, _ in backend.client.query.call_args_list]
+    assert sqls[0] == add_one.js
+    assert all(sql.startswith("SELECT") for sql in sqls[1:])
+
+
+def test_ibis_schema_to_bigquery_schema():
+    schema = ibis.schema(
+        [
+            ("a", dt.Int64(nullable=False)),
+            ("b", "string"),
+            ("c", "array<float64>"),
+            ("d", "struct<x: int64, y: array<string>>"),
+        ]
+    )
+
+    assert ibis_bigquery.client.ibis_schema_to_bigquery_schema(schema) == [
+        bq.SchemaField("a", "INT64", mode="REQUIRED"),
+        bq.SchemaField("b", "STRING"),
+        bq.SchemaField("c", "FLOAT64", mode="REPEATED"),
+        bq.SchemaField(
+            "d",
+            "RECORD",
+            fields=[
+                bq.SchemaField("x", "INT64"),
+                bq.SchemaField("y", "STRING", mode="REPEATED"),
+            ],
+        ),
+    ]
+
+
+def _load_jobs(backend, mocker):
+    loads = []
+
+    def load_table_from_file(buffer, destination, job_config, project):
+        loads.append((pq.read_table(buffer), destination, job_config))
+        return mocker.Mock()
+
+    backend.client.load_table_from_file.side_effect = load_table_from_file
+    return loads
+
+
+def test_create_table_from_dataframe(backend, mocker):
+    loads = _load_jobs(backend, mocker)
+    df = pd.DataFrame({"a": [1, 2, 3, 4, 5], "b": list("vwxyz")})
+
+    backend.create_table("t", df, chunk_size=2)
+
+    (table,), _ = backend.client.create_table.call_args
+    assert table.reference == bq.TableReference.from_string("my-project.my_dataset.t")
+    assert table.schema == [bq.SchemaField("a", "INT64"), bq.SchemaField("b", "STRING")]
+    assert sorted(len(data) for data, _, _ in loads) == [1, 2, 2]
+    assert all(
+        job_config.source_format == bq.SourceFormat.PARQUET
+        and job_config.write_disposition == bq.WriteDisposition.WRITE_APPEND
+        for _, _, job_config in loads
+    )
+    uploaded = [value for data, _, _ in loads for value in data.column("a").to_pylist()]
+    assert sorted(uploaded) == [1, 2, 3, 4, 5]
+
+
+def test_create_table_loads_naive_datetimes_as_utc_timestamps(backend, mocker):
+    loads = _load_jobs(backend, mocker)
+    df = pd.DataFrame({"ts": pd.to_datetime(["2021-01-01 12:00:00.000001"])})
+
+    backend.create_table("t", df)
+
+    (table,), _ = backend.client.create_table.call_args
+    assert table.schema == [bq.SchemaField("ts", "TIMESTAMP")]
+    ((data, _, _),) = loads
+    assert data.schema.field("ts").type == pa.timestamp("us", tz="UTC")
+    assert data.column("ts").to_pylist() == [
+        datetime.datetime(2021, 1, 1, 12, 0, 0, 1, tzinfo=datetime.timezone.utc)
+    ]
+
+
+def test_insert_casts_to_table_schema(backend, mocker):
+    loads = _load_jobs(backend, mocker)
+    backend.client.get_table.return_value = bq.Table(
+        "my-project.my_dataset.t",
+        schema=[bq.SchemaField("dt", "DATETIME"), bq.SchemaField("ts", "TIMESTAMP")],
+    )
+    value = datetime.datetime(2021, 1, 1, 12)
+
+    backend.insert(
+        "t",
+        pa.table(
+            {
+                "dt": pa.array([value], pa.timestamp("ns")),
+                "ts": pa.array([value], pa.timestamp("ns")),
+            }
+        ),
+    )
+
+    ((data, _, _),) = loads
+    assert data.schema.field("dt").type == pa.timestamp("us")
+    assert data.schema.field("ts").type == pa.timestamp("us", tz="UTC")
+
+
+def test_create_table_from_arrow_without_schema(backend, mocker):
+    loads = _load_jobs(backend, mocker)
+
+    backend.create_table("t", pa.table({"a": [1, 2, 3]}), chunk_size=2)
+
+    backend.client.create_table.assert_not_called()
+    dispositions = [job_config.write_disposition for _, _, job_config in loads]
+    assert dispositions == [
+        bq.WriteDisposition.WRITE_EMPTY,
+        bq.WriteDisposition.WRITE_APPEND,
+    ]
+
+
+def test_create_table_requires_obj_or_schema(backend):
+    with pytest.raises(ValueError):
+        backend.create_table("t")
+
+
+def test_insert_overwrite(backend, mocker):
+    loads = _load_jobs(backend, mocker)
+
+    backend.insert("t", pa.table({"a": [1, 2, 3]}), overwrite=True, chunk_size=2)
+
+    dispositions = [job_config.write_disposition for _, _, job_config in loads]
+    assert dispositions == [
+        bq.WriteDisposition.WRITE_TRUNCATE,
+        bq.WriteDisposition.WRITE_APPEND,
+    ]
+    assert all(destination == "my-project.my_dataset.t" for _, destination, _ in loads)
+
+
+def test_insert_expr(backend, mocker):
+    backend.client.query.return_value = _query_job(mocker)
+    t = ibis.table([("a", "int64")], name="source")
+
+    backend.insert("t", t[t.a > 0])
+
+    _, kwargs = backend.client.query.call_args
+    job_config = kwargs["job_config"]
+    assert job_config.destination == bq.TableReference.from_string(
+        "my-project.my_dataset.t"
+    )
+    assert job_config.write_disposition == bq.WriteDisposition.WRITE_APPEND
+
+
+WRITE_STREAM = "projects/my-project/datasets/my_dataset/tables/t/streams/s1"
+
+
+class FakeWriteClient:
+    """A local stand-in for the Storage Write API gRPC client."""
+
+    def __init__(
+        self,
+        errors=None,
+        max_responses=None,
+        drop_connection_at=(),
+        end_connection_at=(),
+    ):
+        self.errors = errors or {}
+        self.max_responses = max_responses
+        # Offsets of requests whose connection is closed by the server before,
+        # or after, their response is sent.
+        self.drop_connection_at = set(drop_connection_at)
+        self.end_connection_at = set(end_connection_at)
+        self.connections = 0
+        self.requests = []
+        self.written = {}
+        self.gate = threading.Event()
+        self.gate.set()
+        self.finalized = []
+        self.committed = []
+        self.stream_type = None
+
+    def create_write_stream(self, parent, write_stream):
+        self.stream_type = write_stream.type_
+        return types.WriteStream(name=parent + "/streams/s1", type_=write_stream.type_)
+
+    def append_rows(self, requests, metadata=()):
+        assert metadata == (("x-goog-request-params", "write_stream=" + WRITE_STREAM),)
+        self.connections += 1
+        for request in requests:
+            if len(self.requests) == self.max_responses:
+                return
+            self.requests.append(request)
+            self.gate.wait()
+            code = self.errors.get(request.offset)
+            if request.offset in self.written:
+                code = 6
+            elif code is None:
+                self.written[request.offset] = request
+            if request.offset in self.drop_connection_at:
+                self.drop_connection_at.remove(request.offset)
+                return
+            if code is None:
+                yield types.AppendRowsResponse(append_result={"offset": request.offset})
+            else:
+                yield types.AppendRowsResponse(
+                    error=status_pb2.Status(code=code, message="failed")
+                )
+            if request.offset in self.end_connection_at:
+                self.end_connection_at.remove(request.offset)
+                return
+
+    def finalize_write_stream(self, name):
+        self.finalized.append(name)
+
+    def batch_commit_write_streams(self, request):
+        self.committed.append(request)
+        return types.BatchCommitWriteStreamsResponse()
+
+    def rows(self):
+        schema = pa.ipc.read_schema(
+            pa.py_buffer(self.requests[0].arrow_rows.writer_schema.serialized_schema)
+        )
+        batches = [
+            pa.ipc.read_record_batch(
+                pa.py_buffer(request.arrow_rows.rows.serialized_record_batch), schema
+            )
+            for _, request in sorted(self.written.items())
+        ]
+        return pa.Table.from_batches(batches).to_pydict()
+
+
+def test_append_stream_offsets(backend):
+    backend.write_client = FakeWriteClient()
+    with backend.append_stream("t") as writer:
+        writer.max_rows_per_request = 2
+        first = writer.append(pd.DataFrame({"a": [1, 2, 3]}))
+        second = writer.append(pa.table({"a": [4]}))
+        assert second.result(timeout=5) == 3
+        assert first.result(timeout=5) == 0
+
+    client = backend.write_client
+    assert [request.offset for request in client.requests] == [0, 2, 3]
+    assert "writer_schema" in client.requests[0].arrow_rows
+    assert "writer_schema" not in client.requests[1].arrow_rows
+    assert client.rows() == {"a": [1, 2, 3, 4]}
+    assert client.stream_type == types.WriteStream.Type.COMMITTED
+    assert client.finalized == [WRITE_STREAM]
+    assert client.committed == []
+
+
+def test_append_stream_limits_in_flight_requests(backend):
+    client = backend.write_client = FakeWriteClient()
+    client.gate.clear()
+    writer = backend.append_stream("t", max_in_flight=2)
+    writer.append(pa.table({"a": [1]}))
+    writer.append(pa.table({"a": [2]}))
+    third = concurrent.futures.ThreadPoolExecutor(1).submit(
+        writer.append, pa.table({"a": [3]})
+    )
+    with pytest.raises(concurrent.futures.TimeoutError):
+        third.result(timeout=0.1)
+
+    client.gate.set()
+    third.result(timeout=5)
+    writer.close()
+    writer.close()
+    assert client.rows() == {"a": [1, 2, 3]}
+    assert len(client.finalized) == 1
+    with pytest.raises(ValueError, match="closed"):
+        writer.append(pa.table({"a": [4]}))
+
+
+def test_append_stream_pending_commits_on_close(backend):
+    client = backend.write_client = FakeWriteClient()
+    with backend.append_stream("t", pending=True) as writer:
+        writer.append(pa.table({"a": [1]}))
+    assert client.stream_type == types.WriteStream.Type.PENDING
+    assert client.committed == [
+        {
+            "parent": "projects/my-project/datasets/my_dataset/tables/t",
+            "write_streams": [WRITE_STREAM],
+        }
+    ]
+
+    client = backend.write_client = FakeWriteClient()
+    with pytest.raises(RuntimeError):
+        with backend.append_stream("t", pending=True) as writer:
+            writer.append(pa.table({"a": [1]}))
+            raise RuntimeError
+    assert client.committed == []
+
+
+def test_append_stream_errors(backend):
+    # An append at an offset that was already written is not an error.
+    client = backend.write_client = FakeWriteClient(errors={0: 6, 1: 3})
+    writer = backend.append_stream("t")
+    assert writer.append(pa.table({"a": [1]})).result(timeout=5) == 0
+    failed = writer.append(pa.table({"a": [2]}))
+    with pytest.raises(ibis.common.exceptions.IbisError, match="failed"):
+        failed.result(timeout=5)
+    with pytest.raises(ibis.common.exceptions.IbisError, match="failed"):
+        writer.close()
+    assert client.finalized == []
+
+
+def _typed_results():
+    return pa.table(
+        {
+            "i": pa.array([1, None]),
+            "s": pa.array(["a", None]),
+            "ts": pa.array(
+                [datetime.datetime(2020, 1, 1, 12), None], pa.timestamp("us", "UTC")
+            ),
+            "d": pa.array([datetime.date(2020, 1, 2), None]),
+            "old": pa.array([datetime.date(1, 1, 1), None]),
+            "b": pa.array([True, None]),
+            "t": pa.array([datetime.time(1), None]),
+        }
+    )
+
+
+def test_arrow_to_pandas_adapts_columns_like_apply_to():
+    schema = ibis.schema(
+        [
+            ("i", "int64"),
+            ("s", "string"),
+            ("ts", "timestamp"),
+            ("d", "date"),
+            ("old", "date"),
+            ("b", "boolean"),
+            ("t", "time"),
+        ]
+    )
+    column_seconds = {}
+
+    df = ibis_bigquery.client.arrow_to_pandas(
+        _typed_results(), schema, column_seconds=column_seconds
+    )
+
+    expected = schema.apply_to(_typed_results().to_pandas())
+    tm.assert_frame_equal(df, expected)
+    assert df["ts"].dtype == "datetime64[ns]"
+    assert df["d"].dtype == "datetime64[ns]"
+    # Only the columns that BigQuery's Arrow types don't give directly are
+    # adapted.
+    assert set(column_seconds) == {"ts", "d"}
+
+
+def test_arrow_to_pandas_recasts_mismatched_columns():
+    schema = ibis.schema([("a", "int8"), ("ts", "timestamp('Europe/Paris')")])
+    table = pa.table(
+        {
+            "a": pa.array([1]),
+            "ts": pa.array([datetime.datetime(2020, 1, 1)], pa.timestamp("us", "UTC")),
+        }
+    )
+    column_seconds = {}
+
+    df = ibis_bigquery.client.arrow_to_pandas(
+        table, schema, column_seconds=column_seconds
+    )
+
+    assert df["a"].dtype == "int8"
+    assert str(df["ts"].dtype) == "datetime64[ns, Europe/Paris]"
+    assert set(column_seconds) == {"a", "ts"}
+
+
+def test_execute_string_dictionary(backend, mocker):
+    backend.client.query.side_effect = lambda *args, **kwargs: _query_job(
+        mocker,
+        pa.table({"country": ["FR", "US", "FR", None], "sku": ["a", "b", "c", "d"]}),
+    )
+    t = ibis.table([("country", "string"), ("sku", "string")], name="t")
+
+    result = backend.execute(t, string_dictionary=["country"])
+
+    assert result["country"].dtype == "category"
+    assert list(result["country"].cat.categories) == ["FR", "US"]
+    assert result["country"].isna().tolist() == [False, False, False, True]
+    assert result["sku"].dtype == object
+
+    result = backend.execute(t.country, string_dictionary=True)
+    assert result.dtype == "category"
+
+
+def test_string_dictionary_schema():
+    schema = ibis.schema([("s", "string"), ("i", "int64")])
+    assert ibis_bigquery.client.string_dictionary_schema(schema) == ibis.schema(
+        [("s", "category"), ("i", "int64")]
+    )
+    assert ibis_bigquery.client.string_dictionary_schema(schema, False) == schema
+    with pytest.raises(ValueError, match="not string"):
+        ibis_bigquery.client.string_dictionary_schema(schema, ["i"])
+    with pytest.raises(ValueError, match="Unknown column"):
+        ibis_bigquery.client.string_dictionary_schema(schema, ["x"])
+
+
+def _scalar_job(mocker, value):
+    query = _query_job(mocker)
+    query.job_id = "job-1"
+    query.total_bytes_processed = 10
+    query.result.side_effect = lambda **kwargs: (
+        [bq.Row((value,), {"value": 0})] if "max_results" in kwargs else None
+    )
+    return query
+
+
+def test_execute_scalar_skips_pandas(backend, mocker):
+    query = _scalar_job(mocker, 3)
+    backend.client.query.return_value = query
+    events = []
+    backend.add_query_listener(events.append)
+    t = ibis.table([("a", "int64")], name="t")
+
+    result = backend.execute(t.count(), maximum_bytes_billed=1000)
+
+    assert result == 3
+    assert isinstance(result, int)
+    query.to_arrow.assert_not_called()
+    query.result.assert_called_with(max_results=1)
+    args, kwargs = backend.client.query.call_args
+    assert args == (backend.compile(t.count()),)
+    assert kwargs["job_config"].maximum_bytes_billed == 1000
+    assert [event.kind for event in events] == [
+        "compile_start",
+        "compile_end",
+        "job_submit",
+        "job_done",
+        "fetch_done",
+    ]
+    assert events[-1].job_id == "job-1"
+    assert events[-1].total_bytes_processed == 10
+
+
+@pytest.mark.parametrize(
+    ["value", "dtype", "expected"],
+    [
+        (None, dt.int64, None),
+        (None, dt.string, None),
+        (None, dt.timestamp, pd.NaT),
+        ("a", dt.string, "a"),
+        (
+            datetime.datetime(2021, 1, 1, 12, tzinfo=datetime.timezone.utc),
+            dt.timestamp,
+            pd.Timestamp("2021-01-01 12:00"),
+        ),
+        (datetime.date(2021, 1, 1), dt.date, pd.Timestamp("2021-01-01")),
+    ],
+)
+def test_bigquery_value_to_scalar(value, dtype, expected):
+    result = ibis_bigquery.client.bigquery_value_to_scalar(value, dtype)
+    if value is None and isinstance(dtype, dt.Integer):
+        assert pd.isna(result) and isinstance(result, float)
+    else:
+        assert result is expected or result == expected
+
+
+@pytest.mark.parametrize("timeout", [None, 5])
+@pytest.mark.parametrize(
+    "exception", [concurrent.futures.TimeoutError, KeyboardInterrupt]
+)
+def test_execute_scalar_cancels_interrupted_job(backend, mocker, exception, timeout):
+    query = _query_job(mocker)
+    query.result.side_effect = exception
+    backend.client.query.return_value = query
+    t = ibis.table([("a", "int64")], name="t")
+
+    with pytest.raises(exception):
+        backend.execute(t.count(), timeout=timeout)
+
+    query.result.assert_called_once_with(timeout=timeout)
+    query.cancel.assert_called_once_with()
+
+
+def test_execute_scalar_retries(backend, mocker):
+    backend.retry_policy = ibis_bigquery.RetryPolicy(initial_delay=0)
+    failed = _query_job(mocker)
+    failed.result.side_effect = google.api_core.exceptions.InternalServerError(
+        "failed", errors=[{"reason": "backendError"}]
+    )
+    backend.client.query.side_effect = [failed, _scalar_job(mocker, 1.5)]
+    t = ibis.table([("a", "double")], name="t")
+
+    assert backend.execute(t.a.sum()) == 1.5
+
+    assert backend.client.query.call_count == 2
+    (record,) = backend.query_log
+    assert record.retries == 1
+
+
+def test_execute_scalar_batch_priority(backend, mocker):
+    backend.client.query.return_value = _scalar_job(mocker, 3)
+    t = ibis.table([("a", "int64")], name="t")
+
+    assert backend.execute(t.count(), priority="batch") == 3
+
+    _, kwargs = backend.client.query.call_args
+    assert kwargs["job_config"].priority == bq.QueryPriority.BATCH
+    assert backend.batch_scheduler.stats().started == 1
+
+
+def _paged_cursor(mocker):
+    pages = {
+        None: {"rows": [{"f": [{"v": "1"}]}, {"f": [{"v": "2"}]}], "pageToken": "p2"},
+        "p2": {"rows": [{"f": [{"v": "3"}]}]},
+    }
+    requested = []
+
+    def api_request(method, path, query_params):
+        requested.append(query_params.get("pageToken"))
+        return pages[query_params.get("pageToken")]
+
+    rows = bq.table.RowIterator(
+        mocker.Mock(), api_request, "/path", [bq.SchemaField("a", "INTEGER")]
+    )
+    job = _query_job(mocker)
+    job.result.return_value = rows
+    return ibis_bigquery.BigQueryCursor(job), requested
+
+
+def test_cursor_fetches_rows_lazily(mocker):
+    cursor, requested = _paged_cursor(mocker)
+
+    assert cursor.columns == ["a"]
+    assert cursor.fetchmany(2) == [(1,), (2,)]
+    assert requested == [None]
+    assert cursor.fetchone() == (3,)
+    assert requested == [None, "p2"]
+    assert cursor.fetchmany() == []
+    assert cursor.fetchall() == []
+    assert [field.name for field in cursor.description] == ["a"]
+    cursor.query.result.assert_called_once_with()
+
+
+def test_cursor_iteration(mocker):
+    cursor, _ = _paged_cursor(mocker)
+    assert list(cursor) == [(1,), (2,), (3,)]
+    with pytest.raises(ValueError, match="rows"):
+        cursor.fetch_arrow_batch()
+
+
+def test_cursor_fetch_arrow_batch(mocker):
+    cursor, requested = _paged_cursor(mocker)
+
+    assert cursor.fetch_arrow_batch().to_pydict() == {"a": [1, 2]}
+    assert requested == [None]
+    assert cursor.fetch_arrow_batch().to_pydict() == {"a": [3]}
+    assert cursor.fetch_arrow_batch() is None
+    with pytest.raises(ValueError, match="Arrow"):
+        cursor.fetchall()
+
+
+def _name_query(mocker, *names):
+    job = _query_job(mocker)
+    job.result.return_value = [bq.Row((name,), {"name": 0}) for name in names]
+    return job
+
+
+def test_list_tables_like_queries_information_schema(backend, mocker):
+    backend.client.query.return_value = _name_query(mocker, "events_20210101")
+
+    assert backend.list_tables(like="^events_2021", page_size=500) == [
+        "events_20210101"
+    ]
+
+    args, kwargs = backend.client.query.call_args
+    assert "`my-project.my_dataset`.INFORMATION_SCHEMA.TABLES" in args[0]
+    assert "REGEXP_CONTAINS(table_name, @pattern)" in args[0]
+    (parameter,) = kwargs["job_config"].query_parameters
+    assert parameter.value == "^events_2021"
+    job = backend.client.query.return_value
+    job.result.assert_called_with(page_size=500)
+    backend.client.list_tables.assert_not_called()
+
+
+def test_list_tables_caches_names(backend, mocker):
+    backend.client.list_tables.return_value = [
+        bq.TableReference.from_string("my-project.my_dataset.a")
+    ]
+
+    assert backend.list_tables() == ["a"]
+    assert backend.list_tables() == ["a"]
+    assert backend.client.list_tables.call_count == 1
+    _, kwargs = backend.client.list_tables.call_args
+    assert kwargs["page_size"] is None
+
+    backend.clear_cache()
+    backend.list_tables()
+    assert backend.client.list_tables.call_count == 2
+
+
+def test_list_databases(backend, mocker):
+    backend.client.list_datasets.return_value = [
+        bq.DatasetReference("my-project", name) for name in ["b", "a", "c"]
+    ]
+    assert backend.list_databases(like="[ab]") == ["a", "b"]
+    backend.client.query.assert_not_called()
+
+    backend.client.query.return_value = _name_query(mocker, "a", "b")
+    assert backend.list_databases(like="[ab]", location="EU") == ["a", "b"]
+    args, _ = backend.client.query.call_args
+    assert "`my-project`.`region-eu`.INFORMATION_SCHEMA.SCHEMATA" in args[0]
+
+
+def test_append_stream_closed_by_server(backend):
+    client = backend.write_client = FakeWriteClient(max_responses=1)
+    writer = backend.append_stream("t")
+    assert writer.append(pa.table({"a": [1]})).result(timeout=5) == 0
+    writer.append(pa.table({"a": [2]}))
+    writer._reader.join(timeout=5)
+
+    with pytest.raises(ibis.common.exceptions.IbisError, match="closed"):
+        writer.append(pa.table({"a": [3]}))
+    with pytest.raises(ibis.common.exceptions.IbisError, match="closed"):
+        writer.flush()
+    with pytest.raises(ibis.common.exceptions.IbisError, match="closed"):
+        writer.close()
+    assert len(client.requests) == 1
+
+
+def test_append_stream_resends_after_reconnecting(backend):
+    client = backend.write_client = FakeWriteClient(drop_connection_at=[1])
+    client.gate.clear()
+    with backend.append_stream("t") as writer:
+        futures = [writer.append(pa.table({"a": [value]})) for value in [1, 2, 3]]
+        client.gate.set()
+        assert [future.result(timeout=5) for future in futures] == [0, 1, 2]
+
+    assert client.connections == 2
+    assert [request.offset for request in client.requests] == [0, 1, 1, 2]
+    # The first request of the new connection describes the data again.
+    assert "writer_schema" in client.requests[2].arrow_rows
+    assert "writer_schema" not in client.requests[3].arrow_rows
+    assert client.rows() == {"a": [1, 2, 3]}
+
+
+def test_append_stream_reconnects_when_idle_connection_is_closed(backend):
+    client = backend.write_client = FakeWriteClient(end_connection_at=[0])
+    writer = backend.append_stream("t")
+    assert writer.append(pa.table({"a": [1]})).result(timeout=5) == 0
+    writer._reader.join(timeout=5)
+    assert writer.append(pa.table({"a": [2]})).result(timeout=5) == 1
+    writer.close()
+
+    assert client.connections == 2
+    assert [request.offset for request in client.requests] == [0, 1]
+    assert client.rows() == {"a": [1, 2]}
+
+
+def test_append_stream_requires_arrow_writes(backend, mocker):
+    mocker.patch("ibis_bigquery.HAS_ARROW_WRITES", False)
+    with pytest.raises(ibis.common.exceptions.UnsupportedOperationError, match="Arrow"):
+        backend.append_stream("t")
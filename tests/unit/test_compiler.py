@@ -653,3 +653,81 @@ FROM t"""
         ibis_bigquery.compile(expr)
     expected = "BigQuery simplify does not support preserving collapsed geometries, must pass preserve_collapsed=False"
     assert str(exception_info.value) == expected
+
+
+def test_compile_cache_key_is_structural():
+    def make_expr():
+        t = ibis.table([("a", "int64"), ("b", "string")], name="t")
+        return t[t.a > 1].b
+
+    assert ibis_bigquery.compiler.compile_cache_key(
+        make_expr()
+    ) == ibis_bigquery.compiler.compile_cache_key(make_expr())
+    assert ibis_bigquery.compiler.compile_cache_key(
+        make_expr()
+    ) != ibis_bigquery.compiler.compile_cache_key(make_expr(), limit=10)
+
+
+def test_compile_cache_key_ignores_parameter_values():
+    t = ibis.table([("a", "int64")], name="t")
+    param = ibis.param("int64")
+    expr = t[t.a > param]
+
+    key = ibis_bigquery.compiler.compile_cache_key
+    assert key(expr, params={param: 1}) == key(expr, params={param: 2})
+    assert key(expr, params={param: 1}) != key(expr)
+
+
+def test_compile_uses_cache(mocker):
+    cache = ibis_bigquery.cache.LRUCache()
+    mocker.patch.object(ibis_bigquery.Backend, "compile_cache", cache)
+    to_ast = mocker.spy(ibis_bigquery.Backend.compiler, "to_ast_ensure_limit")
+    t = ibis.table([("a", "int64")], name="t")
+
+    first = ibis_bigquery.compile(t.a.sum())
+    second = ibis_bigquery.compile(t.a.sum())
+
+    assert first == second
+    assert to_ast.call_count == 1
+    assert cache.info().hits == 1
+    assert cache.info().misses == 1
+
+
+def test_persistent_udf():
+    @ibis_bigquery.udf(
+        input_type=[dt.double], output_type=dt.double, persist_to="my-project.udfs"
+    )
+    def add_one(x):
+        return x + 1
+
+    t = ibis.table([("a", "double")], name="t")
+    expr = t.mutate(b=add_one(t.a))
+
+    sql = ibis_bigquery.compile(expr)
+
+    assert add_one.js.startswith(
+        "CREATE FUNCTION IF NOT EXISTS `my-project.udfs.add_one_"
+    )
+    name = add_one.js.split("(", 1)[0].rsplit(" ", 1)[1]
+    assert sql == "SELECT *, {}(`a`) AS `b`\nFROM t".format(name)
+    assert ibis_bigquery.compiler.persistent_udf_definitions(expr) == [add_one.js]
+
+
+def test_persistent_udf_name_depends_on_definition():
+    persist = ibis_bigquery.udf(
+        input_type=[dt.double], output_type=dt.double, persist_to="udfs"
+    )
+
+    def add(x):
+        return x + 1
+
+    first = persist(add)
+    second = persist(add)
+
+    def add(x):  # noqa: F811
+        return x + 2
+
+    third = persist(add)
+
+    assert first.js == second.js
+    assert first.js != third.js
@@ -0,0 +1,74 @@
+import threading
+import time
+
+import pytest
+
+from ibis_bigquery.scheduler import FairScheduler
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def test_scheduler_limits_concurrency():
+    scheduler = FairScheduler(max_concurrency=2)
+    release = threading.Event()
+    running = []
+    max_running = []
+    lock = threading.Lock()
+
+    def run():
+        with scheduler.slot():
+            with lock:
+                running.append(1)
+                max_running.append(len(running))
+            release.wait()
+            with lock:
+                running.pop()
+
+    threads = [threading.Thread(target=run) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    _wait_for(lambda: scheduler.stats().queued == 3)
+    assert scheduler.stats().running == 2
+
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert max(max_running) == 2
+    stats = scheduler.stats()
+    assert stats.started == 5
+    assert stats.queued == stats.running == 0
+    assert stats.max_wait_seconds >= stats.mean_wait_seconds > 0
+
+
+def test_scheduler_shares_slots_among_callers():
+    scheduler = FairScheduler(max_concurrency=1)
+    order = []
+    threads = []
+
+    def run(caller, name):
+        with scheduler.slot(caller):
+            order.append(name)
+
+    with scheduler.slot("holder"):
+        for caller, name in [("a", "a1"), ("a", "a2"), ("a", "a3"), ("b", "b1")]:
+            queued = scheduler.stats().queued
+            thread = threading.Thread(target=run, args=(caller, name))
+            thread.start()
+            threads.append(thread)
+            _wait_for(lambda: scheduler.stats().queued == queued + 1)
+
+    for thread in threads:
+        thread.join()
+
+    assert order == ["a1", "b1", "a2", "a3"]
+
+
+def test_scheduler_rejects_invalid_concurrency():
+    with pytest.raises(ValueError):
+        FairScheduler(max_concurrency=0)